@@ -2,6 +2,7 @@ import numpy as np
 from pygametools.color import Color
 from pygametools.plotting import Canvas, PlotTester
 from pygametools.plotting.plots import Line, Scatter, Bar, ArrayImage
+from pygametools.loaders import load_delimited
 from PIL import Image, ImageSequence
 
 
@@ -65,8 +66,7 @@ def plot_testimg(tester, pos, dim):
     canvas.set_title('Static Array image')
 
     # Loading/normalizing image and adding noise
-    with open(r'examples\plotting_test_resources\test_img.csv', 'r', encoding='utf-8-sig') as file:
-        value_arr = np.genfromtxt(file, dtype=float, delimiter=';')
+    value_arr = load_delimited(r'examples\plotting_test_resources\test_img.csv')
     value_arr = (value_arr / value_arr.max())
     value_arr = value_arr + np.random.uniform(-0.2,0.2,size=value_arr.shape)
 
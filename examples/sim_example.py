@@ -2,80 +2,326 @@ import pygame
 from pygametools.color.color import Color
 from pygametools.gui.base import Application
 from pygametools.gui.elements import Button, Slider, Label
+from spatial_grid import SpatialGrid
 import numpy as np
 from numba import jit, float64, int32, int64, boolean, prange
 from math import pi, cos, sin, ceil
-
-
-@jit(float64[:,:](float64[:,:], int64, int64, float64), nopython=True)
-def get_subarray(arr, i, j, span):
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import shutil
+import sys
+import time
+
+
+# Trails are tracked in square tiles of TRAIL_TILE_SIZE cells. A tile of a
+# group trail is live while its max value is at least TRAIL_EPSILON; dead
+# tiles are all zero and are skipped by the blur, sensing and compositing
+TRAIL_TILE_SIZE = 32
+TRAIL_EPSILON = 1e-3
+
+# Sensor sums from integral images are differences of larger partial sums, so
+# empty sensors can read a rounding residue instead of zero. Values below
+# SENSOR_EPSILON are snapped to zero, so bots still see ties between empty sensors
+SENSOR_EPSILON = 1e-9
+
+# Supported trail dtypes and the stored value of a full (1.0) trail cell.
+# uint16 trails are fixed point, blurred and decayed with integer weights
+# that have FIXED_WEIGHT_BITS fractional bits
+TRAIL_FIXED_ONE = 65535
+FIXED_WEIGHT_BITS = 32
+TRAIL_SCALES = {
+    np.dtype(np.float64): 1.0,
+    np.dtype(np.float32): 1.0,
+    np.dtype(np.uint16): TRAIL_FIXED_ONE}
+
+
+def trail_tiles_shape(env_dim):
+    """Number of tiles along both axes of a trail of shape env_dim."""
+    return (
+        (env_dim[0] + TRAIL_TILE_SIZE - 1) // TRAIL_TILE_SIZE,
+        (env_dim[1] + TRAIL_TILE_SIZE - 1) // TRAIL_TILE_SIZE)
+
+
+@jit(nopython=True, parallel=True)
+def find_live_tiles(trails, active, trail_scale):
+    """
+    Mark the tiles of the (G, W, H) trails that hold a value of at least
+    TRAIL_EPSILON (times trail_scale, the value of a full cell) in the
+    (G, W/T, H/T) active mask. Other tiles are zeroed, so dead tiles are all
+    zero.
     """
-    Return a single subarray of an array, centered at index and with a size given
-    by the span parameter. Handles sub arrays that fall completely or partially
-    outside the parent array bounds.
+    num_groups, width, height = trails.shape
+    _, num_tiles_x, num_tiles_y = active.shape
+
+    for t in prange(num_groups * num_tiles_x * num_tiles_y):
+        g = t // (num_tiles_x * num_tiles_y)
+        ti = t // num_tiles_y % num_tiles_x
+        tj = t % num_tiles_y
+        i0, i1 = ti * TRAIL_TILE_SIZE, min(width, (ti+1) * TRAIL_TILE_SIZE)
+        j0, j1 = tj * TRAIL_TILE_SIZE, min(height, (tj+1) * TRAIL_TILE_SIZE)
+        active[g, ti, tj] = trails[g, i0:i1, j0:j1].max() >= TRAIL_EPSILON * trail_scale
+        if not active[g, ti, tj]:
+            trails[g, i0:i1, j0:j1] = 0
+
+
+@jit(nopython=True, parallel=True)
+def blur_decay_trails(trails, out, active, out_active, fact, decay):
     """
-    return arr[
-        max(0, i-span) : min(arr.shape[0], i+span+1),
-        max(0, j-span) : min(arr.shape[1], j+span+1)]
+    Box blur all (G, W, H) group trails by combining each cell value and the
+    mean value of its 3x3 neighbourhood, then apply decay and clamp to
+    [0, 1]. Cells outside the trail count as zero. Results are written to out,
+    so every cell reads the unblurred values of its neighbours.
+
+    Only live tiles (see active) and their neighbours, into which the blur
+    spreads, are computed. Tiles of out that end up below TRAIL_EPSILON are
+    zeroed and marked dead in out_active. Within a tile, the blur is
+    separable: each row first sums the three cells above and below each
+    column, then sums three neighbouring column sums.
+    """
+    num_groups, width, height = trails.shape
+    _, num_tiles_x, num_tiles_y = active.shape
+
+    for t in prange(num_groups * num_tiles_x * num_tiles_y):
+        g = t // (num_tiles_x * num_tiles_y)
+        ti = t // num_tiles_y % num_tiles_x
+        tj = t % num_tiles_y
+        trail = trails[g]
+        i0, i1 = ti * TRAIL_TILE_SIZE, min(width, (ti+1) * TRAIL_TILE_SIZE)
+        j0, j1 = tj * TRAIL_TILE_SIZE, min(height, (tj+1) * TRAIL_TILE_SIZE)
+
+        # The tile receives trail if it or one of its neighbours is live
+        live = False
+        for di in range(max(0, ti-1), min(num_tiles_x, ti+2)):
+            for dj in range(max(0, tj-1), min(num_tiles_y, tj+2)):
+                live = live or active[g, di, dj]
+        if not live:
+            if out_active[g, ti, tj]:
+                out[g, i0:i1, j0:j1] = 0
+                out_active[g, ti, tj] = False
+            continue
 
+        # Column sums of rows i-1, i and i+1 for columns j0-1 to j1, zero padded
+        col_sums = np.zeros(j1 - j0 + 2, dtype=float64)
+        peak = 0.0
+        for i in range(i0, i1):
+            col_sums[:] = 0
+            for di in range(max(0, i-1), min(width, i+2)):
+                for j in range(max(0, j0-1), min(height, j1+1)):
+                    col_sums[j-j0+1] += trail[di, j]
+
+            for j in range(j0, j1):
+                k = j - j0
+                mean = (col_sums[k] + col_sums[k+1] + col_sums[k+2]) / 9
+                val = (1 - decay) * (fact * mean + (1-fact) * trail[i, j])
+                val = min(1.0, max(0.0, val))
+                out[g, i, j] = val
+                peak = max(peak, val)
+
+        out_active[g, ti, tj] = peak >= TRAIL_EPSILON
+        if not out_active[g, ti, tj]:
+            out[g, i0:i1, j0:j1] = 0
+
+
+@jit(nopython=True, parallel=True)
+def blur_decay_trails_fixed(trails, out, active, out_active, fact, decay):
+    """
+    Same as blur_decay_trails, for uint16 fixed-point trails where
+    TRAIL_FIXED_ONE is a full cell. Blur and decay are folded into two
+    integer weights with FIXED_WEIGHT_BITS fractional bits, for the 3x3 sum
+    and the cell itself, so each cell takes two integer multiply-adds and a
+    shift. Results are rounded down, so trails always decay to zero.
+    """
+    num_groups, width, height = trails.shape
+    _, num_tiles_x, num_tiles_y = active.shape
+    keep = (1 - decay) * (1 << FIXED_WEIGHT_BITS)
+    neighbour_weight = int64(keep * fact / 9)
+    cell_weight = int64(keep * (1-fact))
+    threshold = int64(TRAIL_EPSILON * TRAIL_FIXED_ONE)
+
+    for t in prange(num_groups * num_tiles_x * num_tiles_y):
+        g = t // (num_tiles_x * num_tiles_y)
+        ti = t // num_tiles_y % num_tiles_x
+        tj = t % num_tiles_y
+        trail = trails[g]
+        i0, i1 = ti * TRAIL_TILE_SIZE, min(width, (ti+1) * TRAIL_TILE_SIZE)
+        j0, j1 = tj * TRAIL_TILE_SIZE, min(height, (tj+1) * TRAIL_TILE_SIZE)
+
+        # The tile receives trail if it or one of its neighbours is live
+        live = False
+        for di in range(max(0, ti-1), min(num_tiles_x, ti+2)):
+            for dj in range(max(0, tj-1), min(num_tiles_y, tj+2)):
+                live = live or active[g, di, dj]
+        if not live:
+            if out_active[g, ti, tj]:
+                out[g, i0:i1, j0:j1] = 0
+                out_active[g, ti, tj] = False
+            continue
 
-@jit(float64[:,:](float64[:,:], float64), nopython=True, parallel=True)
-def blur_array(arr, fact):
+        # Column sums of rows i-1, i and i+1 for columns j0-1 to j1, zero padded
+        col_sums = np.zeros(j1 - j0 + 2, dtype=int64)
+        peak = 0
+        for i in range(i0, i1):
+            col_sums[:] = 0
+            for di in range(max(0, i-1), min(width, i+2)):
+                for j in range(max(0, j0-1), min(height, j1+1)):
+                    col_sums[j-j0+1] += trail[di, j]
+
+            for j in range(j0, j1):
+                k = j - j0
+                block_sum = col_sums[k] + col_sums[k+1] + col_sums[k+2]
+                val = (neighbour_weight * block_sum + cell_weight * int64(trail[i, j])) >> FIXED_WEIGHT_BITS
+                val = min(TRAIL_FIXED_ONE, val)
+                out[g, i, j] = val
+                peak = max(peak, val)
+
+        out_active[g, ti, tj] = peak >= threshold
+        if not out_active[g, ti, tj]:
+            out[g, i0:i1, j0:j1] = 0
+
+
+@jit(nopython=True, parallel=True)
+def integrate_tiles(group_trails, active, integrals, live_tiles):
     """
-    Box blur a complete 2d array by combining each cell value and the mean neighbour value.
+    Build the integral image of each live tile of the group trails, in
+    parallel over tiles. integrals[g, i, j] becomes the sum of trail g over
+    the rows and columns from the start of its tile up to and including
+    (i, j). integrals[-1] holds the integral images of the total trail of all
+    groups, for the tiles where any group is live; these are marked in
+    live_tiles. Dead tiles of integrals are left as is and must not be read.
     """
-    for i in prange(arr.shape[0]):
-        for j in prange(arr.shape[1]):
-            mean = get_subarray(arr, i, j, 1).sum() / 9
-            arr[i,j] = fact * mean + (1-fact) * arr[i,j]
-    return arr
+    num_groups, width, height = group_trails.shape
+    _, num_tiles_x, num_tiles_y = active.shape
+
+    for t in prange(num_tiles_x * num_tiles_y):
+        ti = t // num_tiles_y
+        tj = t % num_tiles_y
+        i0, i1 = ti * TRAIL_TILE_SIZE, min(width, (ti+1) * TRAIL_TILE_SIZE)
+        j0, j1 = tj * TRAIL_TILE_SIZE, min(height, (tj+1) * TRAIL_TILE_SIZE)
+
+        live = False
+        for g in range(num_groups):
+            if not active[g, ti, tj]:
+                continue
+            live = True
+
+            # Running row sums plus the integral of the row above
+            for i in range(i0, i1):
+                row_sum = 0.0
+                for j in range(j0, j1):
+                    row_sum += group_trails[g, i, j]
+                    integrals[g, i, j] = row_sum
+                    if i > i0:
+                        integrals[g, i, j] += integrals[g, i-1, j]
+        live_tiles[ti, tj] = live
+
+        # The integral of the total trail is the sum of the group integrals
+        if live:
+            for i in range(i0, i1):
+                for j in range(j0, j1):
+                    total = 0.0
+                    for g in range(num_groups):
+                        if active[g, ti, tj]:
+                            total += integrals[g, i, j]
+                    integrals[num_groups, i, j] = total
 
 
-@jit(float64(float64[:,:], float64[:], float64, float64, float64, float64),
-     nopython=True)
-def read_sensor(trail, pos, angle, sensor_reach, sensor_size, sensor_angle):
+@jit(nopython=True)
+def read_integral_sensor(integral, active, pos, angle, sensor_reach, sensor_size, sensor_angle):
     """
-    Read a single sensor value.
-
-    Determine the (x,y) sensor midpoint based on an agent position, agent
-    angle sensor reach, sensor size and sensor angle. Then, sum all
-    arr elements around that point in a square with sides of size
-    2*sensor_size and return the result.
+    Read a single sensor value from the tile integral images of a trail (see
+    integrate_tiles): the sum of the trail in a square around the sensor
+    midpoint, which is sensor_reach away from pos in the direction of angle
+    plus sensor_angle. The square has sides of 2*sensor_size+1 cells and is
+    clipped to the trail. The part of the square within each live tile (see
+    active) takes four lookups, so the cost does not grow with the sensor
+    size as long as it spans few tiles.
     """
     true_angle = angle + sensor_angle
     i = int(pos[0] + sensor_reach * cos(true_angle))
     j = int(pos[1] + sensor_reach * sin(true_angle))
-    return get_subarray(trail, i, j, sensor_size).sum()
-
-
-@jit(float64[:](float64[:,:], float64[:,:], float64[:], float64, float64, float64),
-     nopython=True, parallel=True)
-def read_all_sensors(trail, bot_pos, bot_angles, sensor_reach, sensor_size, sensor_angle):
+    span = int(sensor_size)
+
+    # Sensor square clipped to the trail (inclusive bounds)
+    i_lo, i_hi = max(0, i - span), min(integral.shape[0] - 1, i + span)
+    j_lo, j_hi = max(0, j - span), min(integral.shape[1] - 1, j + span)
+    if i_lo > i_hi or j_lo > j_hi:
+        return 0.0
+
+    total = 0.0
+    for ti in range(i_lo // TRAIL_TILE_SIZE, i_hi // TRAIL_TILE_SIZE + 1):
+        for tj in range(j_lo // TRAIL_TILE_SIZE, j_hi // TRAIL_TILE_SIZE + 1):
+            if not active[ti, tj]:
+                continue
+
+            # Part of the square within the tile
+            i0, j0 = ti * TRAIL_TILE_SIZE, tj * TRAIL_TILE_SIZE
+            a0, a1 = max(i_lo, i0), min(i_hi, i0 + TRAIL_TILE_SIZE - 1)
+            b0, b1 = max(j_lo, j0), min(j_hi, j0 + TRAIL_TILE_SIZE - 1)
+            total += integral[a1, b1]
+            if a0 > i0:
+                total -= integral[a0-1, b1]
+            if b0 > j0:
+                total -= integral[a1, b0-1]
+            if a0 > i0 and b0 > j0:
+                total += integral[a0-1, b0-1]
+    return total if abs(total) >= SENSOR_EPSILON else 0.0
+
+
+@jit(nopython=True, parallel=True)
+def read_group_sensors(
+        integrals, active, live_tiles, bot_pos, bot_angles, bot_membership,
+        sensor_reach, sensor_size, sensor_angles, avoidance):
     """
-    Calculate a sensor value for each bot in bot_pos and bot_angles.
+    Calculate the sensor values of all sensor angles for all bots of all
+    groups in one pass, from the tile integral images of the group trails
+    and their total (see integrate_tiles). Each bot senses the trail of its
+    own group, and, with more than one group, avoids the mean trail of the
+    other groups. The latter is read from the total trail of all groups minus
+    the own group.
     """
-    sensor_values = np.zeros(shape=bot_pos.shape[0], dtype=float64)
+    num_groups = integrals.shape[0] - 1
+    sensor_values = np.zeros(shape=(bot_pos.shape[0], sensor_angles.shape[0]), dtype=float64)
 
     for b in prange(bot_pos.shape[0]):
-        sensor_values[b] = read_sensor(
-            trail, bot_pos[b], bot_angles[b], sensor_reach, sensor_size, sensor_angle)
-    
+        g = bot_membership[b]
+        for a in range(sensor_angles.shape[0]):
+            sensor_group = read_integral_sensor(
+                integrals[g], active[g], bot_pos[b], bot_angles[b], sensor_reach,
+                sensor_size, sensor_angles[a])
+            if num_groups > 1:
+                sensor_total = read_integral_sensor(
+                    integrals[num_groups], live_tiles, bot_pos[b], bot_angles[b], sensor_reach,
+                    sensor_size, sensor_angles[a])
+                sensor_other = sensor_total - sensor_group
+                if abs(sensor_other) < SENSOR_EPSILON:
+                    sensor_other = 0.0
+                sensor_other /= num_groups - 1
+                sensor_values[b, a] = (1-avoidance) * sensor_group - avoidance * sensor_other
+            else:
+                sensor_values[b, a] = sensor_group
+
     return sensor_values
 
 
-@jit(nopython=True)
-def deposit_segments(trail, prev_pos, pos):
+@jit(nopython=True, parallel=True)
+def deposit_segments(group_trails, active, bot_membership, prev_pos, pos, trail_scale):
     """
     Rasterize straight-line motion between consecutive bot positions.
 
     For each bot, interpolate between its previous position and its current
-    position and write all intermediate grid cells into the trail array.
-    This prevents gaps when bot speed > 1 grid cell per update.
+    position, fill all intermediate grid cells of the trail of its group
+    (with trail_scale, the value of a full cell) and wake their tiles in
+    active. This prevents gaps when bot
+    speed > 1 grid cell per update. Bots run in parallel; all writes store
+    the same value, so bots that visit the same cell do not race.
     """
-    x_max, y_max = trail.shape
+    _, x_max, y_max = group_trails.shape
     num_bots = pos.shape[0]
 
-    for b in range(num_bots):
+    for b in prange(num_bots):
+        g = bot_membership[b]
+        trail = group_trails[g]
 
         # Start/end positions and displacement vector for current bot
         x0, y0 = prev_pos[b]
@@ -88,7 +334,8 @@ def deposit_segments(trail, prev_pos, pos):
 
         # If the bot did not move enough to cross a cell,  still deposit at the final position
         if num_steps <= 0:
-            trail[int(x1), int(y1)] = 1.0
+            trail[int(x1), int(y1)] = trail_scale
+            active[g, int(x1) // TRAIL_TILE_SIZE, int(y1) // TRAIL_TILE_SIZE] = True
             continue
 
         # Per-step (continuous) increment
@@ -99,20 +346,182 @@ def deposit_segments(trail, prev_pos, pos):
         x = x0
         y = y0
         for _ in range(num_steps + 1):
-            trail[int(x), int(y)] = 1.0
+            trail[int(x), int(y)] = trail_scale
+            active[g, int(x) // TRAIL_TILE_SIZE, int(y) // TRAIL_TILE_SIZE] = True
             x += sx
             y += sy
 
 
+@jit(nopython=True, parallel=True)
+def composite_trails(
+        pixels, group_trails, group_col, bot_pos, bot_accent, brightness,
+        live_tiles, drawn_tiles):
+    """
+    Write the RGB colors of all trails into a (W, H, 3) uint8 pixel array.
+
+    Each cell gets the sum of the group colors weighted by the group trails,
+    clipped to [0, 255]. For trails where a full cell is not 1.0, pass the
+    group colors divided by the value of a full cell. Cells with a bot are accented by moving that color
+    towards white. Finally, the brightness is applied.
+
+    Only tiles where a group is live (see live_tiles) are composited. The
+    pixels of other tiles are zeroed once, when drawn_tiles marks them as
+    drawn; drawn_tiles is updated for the next call on the same pixels.
+    """
+    num_groups, width, height = group_trails.shape
+    num_tiles_x, num_tiles_y = live_tiles.shape
+
+    for t in prange(num_tiles_x * num_tiles_y):
+        ti = t // num_tiles_y
+        tj = t % num_tiles_y
+        i0, i1 = ti * TRAIL_TILE_SIZE, min(width, (ti+1) * TRAIL_TILE_SIZE)
+        j0, j1 = tj * TRAIL_TILE_SIZE, min(height, (tj+1) * TRAIL_TILE_SIZE)
+        if not live_tiles[ti, tj]:
+            if drawn_tiles[ti, tj]:
+                pixels[i0:i1, j0:j1] = 0
+                drawn_tiles[ti, tj] = False
+            continue
+        drawn_tiles[ti, tj] = True
+
+        for i in range(i0, i1):
+            for j in range(j0, j1):
+                for c in range(3):
+                    val = 0.0
+                    for g in range(num_groups):
+                        val += group_col[g, c] * group_trails[g, i, j]
+                    val = min(255.0, max(0.0, val))
+                    pixels[i, j, c] = int(min(255.0, brightness * val))
+
+    # Bots on the same cell write the same value
+    for b in prange(bot_pos.shape[0]):
+        i = int(bot_pos[b, 0])
+        j = int(bot_pos[b, 1])
+        if i < 0 or i >= width or j < 0 or j >= height:
+            continue
+        drawn_tiles[i // TRAIL_TILE_SIZE, j // TRAIL_TILE_SIZE] = True
+        for c in range(3):
+            val = 0.0
+            for g in range(num_groups):
+                val += group_col[g, c] * group_trails[g, i, j]
+            val = min(255.0, max(0.0, val))
+            val += bot_accent * (255 - val)
+            pixels[i, j, c] = int(min(255.0, brightness * val))
+
+
+# Arrays stored in a checkpoint, next to the parameters in Simulation.PARAMS
+CHECKPOINT_ARRAYS = (
+    'bot_pos', 'bot_prev_pos', 'bot_angles', 'bot_membership', 'group_trails',
+    'group_col', 'sensor_angles')
+
+
+def write_checkpoint(path, arrays, params):
+    """
+    Write checkpoint arrays and parameters. Paths ending with .npz are
+    written as one compressed file. Other paths are written as a directory
+    with an uncompressed .npy file per array, which can be memory-mapped on
+    load. The file or directory is written under a temporary name and then
+    renamed as a whole, so an interrupted save never corrupts the previous
+    checkpoint or mixes arrays of two saves.
+    """
+    if path.endswith('.npz'):
+        with open(path + '.tmp', 'wb') as file:
+            np.savez_compressed(file, params=json.dumps(params), **arrays)
+        os.replace(path + '.tmp', path)
+        return
+
+    # Directories can not be replaced while not empty: move the previous
+    # checkpoint aside, which read_checkpoint falls back to, then remove it.
+    tmp_path, old_path = path + '.tmp', path + '.old'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    for name, arr in arrays.items():
+        np.save(os.path.join(tmp_path, name + '.npy'), arr)
+    with open(os.path.join(tmp_path, 'params.json'), 'w') as file:
+        json.dump(params, file)
+    if os.path.isdir(path):
+        shutil.rmtree(old_path, ignore_errors=True)
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+def read_checkpoint(path):
+    """
+    Read the arrays and parameters of a checkpoint written by write_checkpoint.
+    Arrays in a checkpoint directory are memory-mapped copy-on-write, so they
+    load instantly and changing them does not change the checkpoint.
+    """
+    if not os.path.exists(path) and os.path.isdir(path + '.old'):
+        # A directory save was interrupted while swapping in the new one
+        path = path + '.old'
+    if os.path.isdir(path):
+        arrays = {
+            name: np.load(os.path.join(path, name + '.npy'), mmap_mode='c')
+            for name in CHECKPOINT_ARRAYS}
+        with open(os.path.join(path, 'params.json')) as file:
+            params = json.load(file)
+        return arrays, params
+
+    with np.load(path) as data:
+        arrays = {name: data[name] for name in CHECKPOINT_ARRAYS}
+        params = json.loads(str(data['params']))
+    return arrays, params
+
+
+class Autosave:
+
+    def __init__(self, path, interval):
+        """
+        Periodically write a checkpoint of a simulation from a background
+        thread. The simulation state is copied when a save is due, which is
+        fast, and written (and compressed) while the simulation continues.
+        Saves are skipped while the previous one is still being written.
+        """
+        self.path = path
+        self.interval = interval
+        self._last_save = time.time()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._future = None
+
+    def tick(self, simulation):
+        if time.time() - self._last_save < self.interval:
+            return
+        if self._future is not None and not self._future.done():
+            return
+        self._last_save = time.time()
+        arrays, params = simulation.checkpoint_state(copy=True)
+        self._future = self._executor.submit(write_checkpoint, self.path, arrays, params)
+
+    def stop(self):
+        """Wait for a running save to finish."""
+        self._executor.shutdown(wait=True)
+
+
 class Simulation:
 
+    # Settings stored in a checkpoint (num_bots/num_bot_groups follow from the arrays)
+    PARAMS = (
+        'sensor_distance', 'sensor_size', 'brightness', 'bot_accent', 'blur_factor',
+        'decay', 'bot_speed', 'randomness', 'angle_nudge', 'avoidance',
+        'mouse_range', 'mouse_strenght')
+
     def __init__(
             self,
             env_dim: tuple[int, int],
-            window_size: tuple[int, int]):
+            window_size: tuple[int, int],
+            seed: int | None = None,
+            dtype=np.float64):
         self.env_dim = env_dim
         self.window_size = window_size
 
+        # Trail dtype: float64, float32 or uint16 (fixed point, see TRAIL_SCALES)
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in TRAIL_SCALES:
+            raise ValueError(f'Unsupported trail dtype {self.dtype}, use one of {list(TRAIL_SCALES)}')
+
+        # All randomness (bot placement, steering noise, colors) comes from rng
+        self.rng = np.random.default_rng(seed)
+
         # Settings (constant)
         self.sensor_distance = 4
         self.sensor_size = 1
@@ -134,13 +543,33 @@ class Simulation:
         self._num_bots = 1
         self._num_bot_groups = 1
         
-        # Bot/group variable based on num bots/groups
-        self.bot_membership = np.zeros((0,))
-        self.bot_pos = np.zeros((0, 2))
-        self.bot_prev_pos = np.zeros((0, 2))
-        self.bot_angles = np.zeros((0,))
-        self.group_trails = np.zeros((0, *self.env_dim))
+        # Bot/group variable based on num bots/groups. Bots are stored sorted by
+        # group in buffers with spare capacity; bot_pos etc. are views on the
+        # first num_bots rows, and group g owns rows group_offsets[g]:group_offsets[g+1]
+        self._capacity = 0
+        self._bot_buffers = {
+            'bot_pos': np.zeros((0, 2)),
+            'bot_prev_pos': np.zeros((0, 2)),
+            'bot_angles': np.zeros((0,)),
+            'bot_membership': np.zeros((0,), dtype=np.int64)}
+        self.group_offsets = np.zeros(1, dtype=np.int64)
+        self._sync_bot_views(0)
+
+        # Spatial hash over bot_pos for neighbour queries (e.g. mouse range)
+        self.grid = SpatialGrid(self.env_dim, cell_size=8)
+        self.group_trails = np.zeros((0, *self.env_dim), dtype=self.dtype)
         self.group_col = np.zeros((0, 3))
+
+        # Live tiles per group trail, the tiles where any group is live and
+        # the tile integral images of the group trails and their total for
+        # sensing; set by _sync_trail_tiles
+        self.active_tiles = np.zeros((0, *trail_tiles_shape(self.env_dim)), dtype=np.bool_)
+        self.live_tiles = np.zeros(trail_tiles_shape(self.env_dim), dtype=np.bool_)
+        self._integrals = np.zeros((1, *self.env_dim))
+
+        # Back buffer for the trails and their live tiles, swapped after each blur
+        self._trail_buffer = np.zeros((0, *self.env_dim), dtype=self.dtype)
+        self._buffer_active_tiles = np.zeros_like(self.active_tiles)
         self.update_bot_counts()
 
         # Mouse interaction
@@ -148,6 +577,32 @@ class Simulation:
         self.mouse_hold_right = False
         self.mouse_hold_left = False
 
+        # Drawing surfaces, created at the first draw, and the drawn tiles of _surface
+        self._surface = None
+        self._scaled_surface = None
+        self._drawn_tiles = None
+
+        # Optional periodic background checkpoint
+        self._autosave = None
+
+    def __getstate__(self):
+        """
+        Pygame surfaces and the autosave thread can not be pickled, e.g. for
+        a worker process.
+        """
+        state = self.__dict__.copy()
+        state['_surface'] = None
+        state['_scaled_surface'] = None
+        state['_drawn_tiles'] = None
+        state['_autosave'] = None
+        for name in self._bot_buffers:
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._sync_bot_views(self.group_offsets[-1])
+
     # Properties set by UI controls
     @property
     def num_bots(self):
@@ -176,6 +631,10 @@ class Simulation:
     def min_num_bots_per_group(self):
         return int(self._num_bots / self._num_bot_groups)
 
+    def group_slice(self, g):
+        """Rows of the bot arrays that belong to group g."""
+        return slice(self.group_offsets[g], self.group_offsets[g+1])
+
     # Other properties
     @property
     def mouse_pos(self):
@@ -193,14 +652,14 @@ class Simulation:
         """
         Called from dedicated button in gui.
         """
-        self.group_col = np.vstack([Color.random_vibrant() for i in self.group_idx])
+        self.group_col = np.vstack([Color.random_vibrant(self.rng) for i in self.group_idx])
         print(self.group_col)
 
     def reset_pos(self):
         """
         Called from dedicated button in gui.
         """
-        self.bot_pos = np.full((self.num_bots, 2), np.divide(self.env_dim, 2))
+        self.bot_pos[:] = np.divide(self.env_dim, 2)
 
     def reset_all(self):
         """
@@ -208,94 +667,206 @@ class Simulation:
         """
         self.reset_pos()
         self.group_trails[:] = 0
+        self._sync_trail_tiles()
+
+    @property
+    def trail_scale(self):
+        """Stored value of a full (1.0) trail cell."""
+        return TRAIL_SCALES[self.dtype]
+
+    def _sync_trail_tiles(self):
+        """
+        Recompute the live tiles and the integral images from group_trails, after
+        the trails were changed outside of update() (e.g. a checkpoint).
+        """
+        if not self.group_trails.flags.writeable:
+            # Read-only view published by an UpdateProcess: this object is
+            # only drawn, and its tiles arrive with the next frame
+            return
+        self.group_trails = np.ascontiguousarray(self.group_trails)
+        tiles_shape = trail_tiles_shape(self.group_trails.shape[1:])
+        self.active_tiles = np.zeros((self.group_trails.shape[0], *tiles_shape), dtype=np.bool_)
+        find_live_tiles(self.group_trails, self.active_tiles, self.trail_scale)
+
+        self._integrals = np.zeros((self.group_trails.shape[0] + 1, *self.group_trails.shape[1:]))
+        self.live_tiles = np.zeros(tiles_shape, dtype=np.bool_)
+        integrate_tiles(self.group_trails, self.active_tiles, self._integrals, self.live_tiles)
+
+        self._trail_buffer = np.zeros_like(self.group_trails)
+        self._buffer_active_tiles = np.zeros_like(self.active_tiles)
+
+    def _sync_bot_views(self, num_bots):
+        """Point the bot arrays at the first num_bots rows of their buffers."""
+        for name, buffer in self._bot_buffers.items():
+            setattr(self, name, buffer[:num_bots])
+
+    def _reserve_bots(self, num_bots, num_live):
+        """
+        Make sure the bot buffers can hold num_bots bots. Buffers grow by at
+        least 1.5x, so dragging the num_bots slider rarely reallocates.
+        """
+        if num_bots <= self._capacity:
+            return
+        self._capacity = max(num_bots, int(1.5 * self._capacity), 1024)
+        for name, buffer in self._bot_buffers.items():
+            grown = np.zeros((self._capacity, *buffer.shape[1:]), dtype=buffer.dtype)
+            grown[:num_live] = buffer[:num_live]
+            self._bot_buffers[name] = grown
+
+    def _adopt_bot_arrays(self):
+        """
+        Copy bot arrays that were assigned directly (e.g. from a checkpoint)
+        into the buffers, sorted by group, and rebuild the group offsets.
+        """
+        order = np.argsort(self.bot_membership, kind='stable')
+        arrays = {name: np.asarray(getattr(self, name))[order] for name in self._bot_buffers}
+        num_bots = order.shape[0]
+        self._reserve_bots(num_bots, 0)
+        for name, arr in arrays.items():
+            self._bot_buffers[name][:num_bots] = arr
+        sizes = np.bincount(arrays['bot_membership'], minlength=self._num_bot_groups)
+        self.group_offsets = np.concatenate([[0], np.cumsum(sizes)])
+        self._sync_bot_views(num_bots)
 
     def update_bot_counts(self):
         """
         Called when the number of bots/groups are updateted to re-determine memberships.
+
+        Bots stay sorted by group. When only the number of bots changes, each
+        group keeps its bots and its block is shifted in place to its new
+        offset; new bots fill the end of each block. When the number of
+        groups changes, bots keep their order and are regrouped.
         """
-        # Update bot membership and deal with uneven bot group counts
-        bot_membership = np.repeat(self.group_idx, self.min_num_bots_per_group)
-        num_bots_too_little = self._num_bots - bot_membership.shape[0]
-        extra_bots = self.group_idx[:num_bots_too_little]
-        self.bot_membership = np.hstack([bot_membership, extra_bots])
+        num_bots, num_groups = self._num_bots, self._num_bot_groups
+        old_offsets = self.group_offsets
+        old_num_bots = old_offsets[-1]
+
+        # Group sizes; the first groups get one extra bot for uneven counts
+        sizes = np.full(num_groups, num_bots // num_groups, dtype=np.int64)
+        sizes[:num_bots % num_groups] += 1
+        offsets = np.concatenate([[0], np.cumsum(sizes)])
+
+        self._reserve_bots(num_bots, old_num_bots)
+        buffers = self._bot_buffers
+
+        # Kept bots per group and their (source, destination) rows
+        if len(old_offsets) - 1 == num_groups:
+            kept = np.minimum(np.diff(old_offsets), sizes)
+            blocks = list(zip(old_offsets[:-1], offsets[:-1], kept))
+        else:
+            kept = np.clip(old_num_bots - offsets[:-1], 0, sizes)
+            blocks = [(offsets[0], offsets[0], min(old_num_bots, num_bots))]
+
+        # Shift blocks in place: right-to-left when they move right, and
+        # left-to-right when they move left, so no block overwrites another
+        if num_bots > old_num_bots:
+            blocks = blocks[::-1]
+        for src, dst, num in blocks:
+            if src != dst and num > 0:
+                for buffer in buffers.values():
+                    buffer[dst:dst+num] = buffer[src:src+num]
+
+        # Fill the remaining rows of each group with new random bots
+        num_new = int((sizes - kept).sum())
+        new_pos = self.rng.uniform((0,0), self.env_dim, (num_new, 2))
+        new_angles = self.rng.uniform(0, 2*pi, size=num_new)
+        i = 0
+        for g in range(num_groups):
+            start, stop = offsets[g] + kept[g], offsets[g+1]
+            buffers['bot_pos'][start:stop] = new_pos[i:i + stop - start]
+            buffers['bot_prev_pos'][start:stop] = new_pos[i:i + stop - start]
+            buffers['bot_angles'][start:stop] = new_angles[i:i + stop - start]
+            buffers['bot_membership'][offsets[g]:stop] = g
+            i += stop - start
+
+        self.group_offsets = offsets
+        self._sync_bot_views(num_bots)
+        self.grid.invalidate()
 
         # Determine deltas
         delta_num_groups = self._num_bot_groups - self.group_trails.shape[0]
-        delta_num_bots = self._num_bots - self.bot_pos.shape[0]
-
-        # Update pos and prev pos
-        if delta_num_bots > 0:
-            new_pos = np.random.uniform((0,0), self.env_dim, (delta_num_bots, 2))
-            self.bot_pos = np.vstack((self.bot_pos, new_pos))
-
-            new_prev = new_pos.copy()
-            self.bot_prev_pos = np.vstack((self.bot_prev_pos, new_prev))
-        else:
-            self.bot_pos = self.bot_pos[:self._num_bots]
-            self.bot_prev_pos = self.bot_prev_pos[:self._num_bots]
-
-        # Update angles
-        if delta_num_bots > 0:
-            new_angles = np.random.uniform(0, 2*pi, size=delta_num_bots)
-            self.bot_angles = np.hstack((self.bot_angles, new_angles))
-        else:
-            self.bot_angles = self.bot_angles[:self._num_bots]
 
         # Update trails
         if delta_num_groups > 0:
-            new_trails = np.zeros((delta_num_groups, *self.group_trails.shape[1:]))
+            new_trails = np.zeros((delta_num_groups, *self.group_trails.shape[1:]), dtype=self.dtype)
             self.group_trails = np.vstack((self.group_trails, new_trails))
         else:
             self.group_trails = self.group_trails[:self._num_bot_groups]
 
         # Update colors
         if delta_num_groups > 0:
-            new_colors = np.vstack([Color.random_vibrant() for i in range(delta_num_groups)])
+            new_colors = np.vstack([Color.random_vibrant(self.rng) for i in range(delta_num_groups)])
             self.group_col = np.vstack((self.group_col, new_colors))
         else:
             self.group_col = self.group_col[:self._num_bot_groups]
 
+        self._sync_trail_tiles()
+
+    # Checkpoints
+    def checkpoint_state(self, copy=False):
+        """Return the checkpoint arrays and parameters."""
+        arrays = {name: np.asarray(getattr(self, name)) for name in CHECKPOINT_ARRAYS}
+        if copy:
+            arrays = {name: arr.copy() for name, arr in arrays.items()}
+        params = {name: float(getattr(self, name)) for name in self.PARAMS}
+        return arrays, params
+
+    def save_checkpoint(self, path):
+        """
+        Save bots, trails, colors and parameters to a compressed .npz file,
+        or to a directory of memory-mappable .npy files for large envs.
+        """
+        write_checkpoint(path, *self.checkpoint_state())
+
+    def load_checkpoint(self, path):
+        """Restore the state saved with save_checkpoint."""
+        arrays, params = read_checkpoint(path)
+        for name, arr in arrays.items():
+            setattr(self, name, arr)
+        for name, val in params.items():
+            setattr(self, name, val)
+        self.env_dim = self.group_trails.shape[1:]
+        self.dtype = self.group_trails.dtype
+        self._num_bots = self.bot_pos.shape[0]
+        self._num_bot_groups = self.group_trails.shape[0]
+        self._adopt_bot_arrays()
+        self.grid = SpatialGrid(self.env_dim, self.grid.cell_size)
+        self._sync_trail_tiles()
+        self._surface = None
+
+    def start_autosave(self, path, interval=60):
+        """Save a checkpoint every interval seconds, from a background thread."""
+        self.stop_autosave()
+        self._autosave = Autosave(path, interval)
+
+    def stop_autosave(self):
+        if self._autosave is not None:
+            self._autosave.stop()
+            self._autosave = None
+
     # Simulation methods
     def update(self, enable_mouse_interation: bool=False):
 
-        # Save previous bot positions
+        # Save previous bot positions and track them in the spatial grid
         self.bot_prev_pos[:] = self.bot_pos
+        self.grid.update(self.bot_pos)
         
-        # Read bot sensors and determine direction preference
-        for g in self.group_idx:
-            group_mask = self.bot_membership==g
-
-            group_bot_pos = self.bot_pos[group_mask]
-            group_bot_angles = self.bot_angles[group_mask]
-            group_trail = self.group_trails[g]
-            other_trail = self.group_trails[self.group_idx[self.group_idx!=g]].mean(axis=0)
-
-            group_sensor_values = np.zeros((group_mask.sum(), len(self.sensor_angles)))
-
-            for a, sensor_angle in enumerate(self.sensor_angles):
-                sensor_group = read_all_sensors(
-                    group_trail, group_bot_pos, group_bot_angles, self.sensor_distance, 
-                    self.sensor_size, sensor_angle)
-                sensor_other = read_all_sensors(
-                    other_trail, group_bot_pos, group_bot_angles, self.sensor_distance, 
-                    self.sensor_size, sensor_angle)
-                
-                if self._num_bot_groups > 1: 
-                    group_sensor_values[:,a] = (1-self.avoidance) * sensor_group - self.avoidance * sensor_other
-                else:
-                    group_sensor_values[:,a] = sensor_group
- 
-            # Nudge angle to highest sensor value
-            group_angle_preference = self.sensor_angles[group_sensor_values.argmax(axis=1)]
-            self.bot_angles[group_mask] += self.angle_nudge * group_angle_preference 
-
-
-        # Interaction with mouse (pull/push bots from the current mouse pos)
-        if enable_mouse_interation:
-    
-            # Calculate bot-mouse distance and a linear distance factor (1 = closest)
-            bot_mouse_vec = np.reshape(self.mouse_pos, (1,2)) - self.bot_pos
+        # Read bot sensors and nudge angles to the highest sensor value
+        sensor_values = read_group_sensors(
+            self._integrals, self.active_tiles, self.live_tiles, self.bot_pos,
+            self.bot_angles, self.bot_membership, self.sensor_distance, self.sensor_size,
+            self.sensor_angles, self.avoidance)
+        self.bot_angles += self.angle_nudge * self.sensor_angles[sensor_values.argmax(axis=1)]
+
+        # Interaction with mouse (pull/push bots within mouse range from the current mouse pos)
+        if enable_mouse_interation and (self.mouse_hold_left or self.mouse_hold_right):
+
+            # Bots within range, their distance to the mouse and a linear distance factor (1 = closest)
+            near = self.grid.query_radius(self.mouse_pos, self.mouse_range)
+            bot_mouse_vec = np.reshape(self.mouse_pos, (1,2)) - self.bot_pos[near]
             bot_mouse_dis = np.linalg.norm(bot_mouse_vec, axis=1).reshape((-1,1))
+            moved = bot_mouse_dis[:, 0] > 0
+            near, bot_mouse_vec, bot_mouse_dis = near[moved], bot_mouse_vec[moved], bot_mouse_dis[moved]
             dist_factor = 1 - np.clip(bot_mouse_dis, 0, self.mouse_range) / self.mouse_range
 
             # Calculate the vector and angle from each bot to the mouse
@@ -303,19 +874,19 @@ class Simulation:
             bot_mouse_angle = np.atan2(bot_mouse_vec_unit[:, 1], bot_mouse_vec_unit[:, 0])
 
             # Compute the smallest delta between current bot angles and the bot-mouse angles
-            bot_mouse_angle_delta = (bot_mouse_angle - self.bot_angles + pi) % (2 * pi) - pi
-    
+            bot_mouse_angle_delta = (bot_mouse_angle - self.bot_angles[near] + pi) % (2 * pi) - pi
+
             # Adjust positions and nudge angles
             if self.mouse_hold_left:
-                self.bot_pos = self.bot_pos + dist_factor * self.mouse_strenght * bot_mouse_vec_unit
-                self.bot_angles = self.bot_angles + 0.1 * dist_factor.flatten() * bot_mouse_angle_delta
+                self.bot_pos[near] += dist_factor * self.mouse_strenght * bot_mouse_vec_unit
+                self.bot_angles[near] += 0.1 * dist_factor.flatten() * bot_mouse_angle_delta
 
             if self.mouse_hold_right:
-                self.bot_pos = self.bot_pos - dist_factor * self.mouse_strenght * bot_mouse_vec_unit
-                self.bot_angles = self.bot_angles - 0.1 * dist_factor.flatten() * bot_mouse_angle_delta
+                self.bot_pos[near] -= dist_factor * self.mouse_strenght * bot_mouse_vec_unit
+                self.bot_angles[near] -= 0.1 * dist_factor.flatten() * bot_mouse_angle_delta
 
         # Randomly adjust bot angles
-        self.bot_angles += np.random.uniform(
+        self.bot_angles += self.rng.uniform(
             low=-self.randomness,
             high=self.randomness,
             size=self.num_bots)
@@ -344,70 +915,104 @@ class Simulation:
         self.bot_pos[ub_y, 1] = 2 * max_y - self.bot_pos[ub_y, 1]
 
         # Set angle back to [0, 2pi]
-        self.bot_angles = self.bot_angles % (2 * pi)
+        self.bot_angles %= 2 * pi
 
         # Update the trails of each group with the new positions of its bot members
         # Also deposit trails for interpolated cells between prev pos and current pos 
-        for g in self.group_idx:
-            mask = self.bot_membership == g
-            deposit_segments(self.group_trails[g], self.bot_prev_pos[mask], self.bot_pos[mask])
+        deposit_segments(
+            self.group_trails, self.active_tiles, self.bot_membership, self.bot_prev_pos,
+            self.bot_pos, self.trail_scale)
 
-        # Blur and apply decay to the trails of each group
-        for g in self.group_idx:
-            self.group_trails[g] = blur_array(self.group_trails[g], self.blur_factor)
+        # Blur and apply decay to the live tiles of all groups, into the back buffer
+        blur_decay = blur_decay_trails_fixed if self.dtype == np.uint16 else blur_decay_trails
+        blur_decay(
+            self.group_trails, self._trail_buffer, self.active_tiles,
+            self._buffer_active_tiles, self.blur_factor, self.decay)
+        self.group_trails, self._trail_buffer = self._trail_buffer, self.group_trails
+        self.active_tiles, self._buffer_active_tiles = self._buffer_active_tiles, self.active_tiles
 
-        self.group_trails *= (1 - self.decay)
+        # Integral images for sensing in the next step, and the tiles to draw
+        integrate_tiles(self.group_trails, self.active_tiles, self._integrals, self.live_tiles)
 
-    def draw(self, screen, zoom, pan_offset):
-        
-        # Initialize color array
-        arr_draw_rgb = arr_draw_rgb = np.zeros((*self.env_dim, 3))
+        if self._autosave is not None:
+            self._autosave.tick(self)
 
-        # apply bot color to trails and combine their average into color array
-        for i in self.group_idx:
-            trail_col = self.group_col[i] * self.group_trails[i,:,:,np.newaxis]
-            arr_draw_rgb += trail_col
-        
-        arr_draw_rgb = np.clip(arr_draw_rgb, 0, 255)
- 
-        # Accent bots positions on color array by making them brighter
-        bot_x = tuple(self.bot_pos[:,0].flatten().astype(int))
-        bot_y = tuple(self.bot_pos[:,1].flatten().astype(int))
-        arr_draw_rgb[bot_x, bot_y, :] += self.bot_accent * (255 - arr_draw_rgb[bot_x, bot_y, :])
-
-        # Adjust brightness and draw zoomed/panned color array
-        arr_draw_rgb = arr_draw_rgb * self.brightness
-        arr_surface = pygame.surfarray.make_surface(arr_draw_rgb)
+    def draw_state(self):
+        """
+        Copy of the arrays that are drawn, for drawing on a render thread
+        while the simulation is updated.
+        """
+        return (
+            self.bot_pos.copy(), self.group_trails.copy(), self.group_col.copy(),
+            self.live_tiles.copy())
+
+    def draw(self, screen, zoom, pan_offset, state=None):
+        bot_pos, group_trails, group_col, live_tiles = state if state is not None else (
+            self.bot_pos, self.group_trails, self.group_col, self.live_tiles)
+
+        if self._surface is None:
+            self._surface = pygame.Surface(self.env_dim, depth=24)
+            self._scaled_surface = pygame.Surface(self.window_size, depth=24)
+            self._drawn_tiles = np.ones(live_tiles.shape, dtype=np.bool_)
+
+        # Composite the live tiles straight into the pixels of the persistent surface
+        pixels = pygame.surfarray.pixels3d(self._surface)
+        composite_trails(
+            pixels, group_trails, group_col / self.trail_scale, bot_pos, self.bot_accent, self.brightness,
+            live_tiles, self._drawn_tiles)
+        del pixels
+
+        # Draw zoomed/panned, scaling into a surface that is reused until the zoom changes
         zoomed_window_size = tuple(np.multiply(zoom, self.window_size).astype(int))
-        arr_surface = pygame.transform.scale(arr_surface, zoomed_window_size)
-        rect = arr_surface.get_rect()
-        rect = rect.move(pan_offset)
-        screen.blit(arr_surface, rect)
+        if self._scaled_surface.get_size() != zoomed_window_size:
+            self._scaled_surface = pygame.Surface(zoomed_window_size, depth=24)
+        pygame.transform.scale(self._surface, zoomed_window_size, self._scaled_surface)
+        screen.blit(self._scaled_surface, pan_offset)
 
 
 class App(Application):
 
-    def __init__(self, window_size, simulation):
-        super().__init__(window_size, theme_name="default_dark")
+    def __init__(self, window_size, simulation, use_process=False, threaded_render=False):
+        super().__init__(
+            window_size, theme_name="default_dark", threaded_render=threaded_render)
         self.simulation = simulation
 
+        # With use_process, the simulation is updated in a worker process and
+        # GUI changes go through controls, which forwards them to the worker
+        self.controls = simulation
+        if use_process:
+            update_process = self.run_in_process(
+                simulation, state_attrs=('bot_pos', 'group_trails', 'group_col', 'live_tiles'))
+            self.controls = update_process.params
+
     def update(self):
-        self.simulation.update(
-            enable_mouse_interation=(not self.container.is_active))
+        enable_mouse_interation = not self.container.is_active
+        if self.update_process is None:
+            self.simulation.update(enable_mouse_interation=enable_mouse_interation)
+        else:
+            self.update_process.set_update_kwargs(
+                enable_mouse_interation=enable_mouse_interation)
 
         # Calucate mouse pos adjusted by zoom and pan offset and pass to simulation
-        self.simulation.mouse_pos = self.mouse_pos_draw
+        self.controls.mouse_pos = self.mouse_pos_draw
 
         if pygame.BUTTON_RIGHT in self.key_events['hold']:
-            self.simulation.mouse_hold_right = True
+            self.controls.mouse_hold_right = True
         elif pygame.BUTTON_LEFT in self.key_events['hold']:
-            self.simulation.mouse_hold_left = True
+            self.controls.mouse_hold_left = True
         else:
-            self.simulation.mouse_hold_right = False
-            self.simulation.mouse_hold_left = False
+            self.controls.mouse_hold_right = False
+            self.controls.mouse_hold_left = False
+
+    def snapshot(self):
+        return self.simulation.draw_state(), self.zoom, self.pan_offset
 
     def draw(self):
-        self.simulation.draw(self.screen, self.zoom, self.pan_offset)
+        if self.draw_snapshot is None:
+            self.simulation.draw(self.screen, self.zoom, self.pan_offset)
+            return
+        state, zoom, pan_offset = self.draw_snapshot
+        self.simulation.draw(self.screen, zoom, pan_offset, state)
 
 
 def main():
@@ -421,25 +1026,42 @@ def main():
     simulation = Simulation(
         env_dim=(250, 250),
         window_size=window_size)
-    simulation.reset_pos()
 
-    app = App(window_size, simulation)
+    # Slider start values
+    defaults = {
+        'brightness': 0.5, 'bot_accent': 0.2, 'blur_factor': 0.25, 'decay': 0.2,
+        'num_bots': 10, 'num_bot_groups': 3, 'bot_speed': 3, 'randomness': 0.1,
+        'angle_nudge': 0.9, 'avoidance': 0.75, 'mouse_range': 100, 'mouse_strenght': 1}
+
+    # Optional checkpoint (.npz file or directory): resumed if it exists and autosaved
+    checkpoint = sys.argv[1] if len(sys.argv) > 1 else None
+    if checkpoint is not None and os.path.exists(checkpoint):
+        simulation.load_checkpoint(checkpoint)
+        defaults.update(
+            {name: getattr(simulation, name) for name in defaults})
+    else:
+        simulation.reset_pos()
+
+    app = App(window_size, simulation, use_process=True, threaded_render=True)
+    controls = app.controls
+    if checkpoint is not None:
+        controls.start_autosave(checkpoint, 60)
 
     gui_list = [
         Slider(
-            simulation,
+            controls,
             'brightness',
             domain=(0, 1),
-            default=0.5,
+            default=defaults['brightness'],
             pos=(10, 10),
             width=ui_width,
             height=20,
             theme_name=theme),
         Slider(
-            simulation,
+            controls,
             'bot_accent',
             domain=(0, 1),
-            default=0.2,
+            default=defaults['bot_accent'],
             pos=(10, 20),
             width=ui_width,
             height=20,
@@ -447,19 +1069,19 @@ def main():
 
 
         Slider(
-            simulation,
+            controls,
             'blur_factor',
             domain=(0, 0.5),
-            default=0.25,
+            default=defaults['blur_factor'],
             pos=(10, 40),
             width=ui_width,
             height=20,
             theme_name=theme),
         Slider(
-            simulation,
+            controls,
             'decay',
             domain=(0, 0.4),
-            default=0.2,
+            default=defaults['decay'],
             pos=(10, 50),
             width=ui_width,
             height=20,
@@ -467,19 +1089,19 @@ def main():
 
 
         Slider(
-            simulation,
+            controls,
             'num_bots',
             domain=(1, 10000),
-            default=10,
+            default=defaults['num_bots'],
             pos=(10, 70),
             width=ui_width,
             height=20,
             theme_name=theme),
         Slider(
-            simulation,
+            controls,
             'num_bot_groups',
             domain=(1, 8),
-            default=3,
+            default=defaults['num_bot_groups'],
             pos=(10, 80),
             width=ui_width,
             height=20,
@@ -490,56 +1112,56 @@ def main():
 
 
         Slider(
-            simulation,
+            controls,
             'bot_speed',
             domain=(0, 4),
-            default=3,
+            default=defaults['bot_speed'],
             pos=(10, 100),
             width=ui_width,
             height=20,
             theme_name=theme),
         Slider(
-            simulation,
+            controls,
             'randomness',
             domain=(0, 1),
-            default=0.1,
+            default=defaults['randomness'],
             pos=(10, 110),
             width=ui_width,
             height=20,
             theme_name=theme),
         Slider(
-            simulation,
+            controls,
             'angle_nudge',
             domain=(0, 1),
-            default=0.9,
+            default=defaults['angle_nudge'],
             pos=(10, 120),
             width=ui_width,
             height=20,
             theme_name=theme),
         Slider(
-            simulation,
+            controls,
             'avoidance',
             domain=(0, 1),
-            default=0.75,
+            default=defaults['avoidance'],
             pos=(10, 130),
             width=ui_width,
             height=20,
             theme_name=theme),
 
         Slider(
-            simulation,
+            controls,
             'mouse_range',
             domain=(10, 200),
-            default=100,
+            default=defaults['mouse_range'],
             pos=(10, 150),
             width=ui_width,
             height=20,
             theme_name=theme),
         Slider(
-            simulation,
+            controls,
             'mouse_strenght',
             domain=(0, 5),
-            default=1,
+            default=defaults['mouse_strenght'],
             pos=(10, 160),
             width=ui_width,
             height=20,
@@ -547,21 +1169,21 @@ def main():
         
         Button(
             text='colors',
-            func=simulation.generate_colors,
+            func=controls.generate_colors,
             pos=(window_size[0]-70, 10),
             width=ui_width,
             height=20,
             theme_name=theme),
         Button(
             text='reset pos',
-            func=simulation.reset_pos,
+            func=controls.reset_pos,
             pos=(window_size[0]-70, 40),
             width=ui_width,
             height=20,
             theme_name=theme),
         Button(
             text='reset all',
-            func=simulation.reset_all,
+            func=controls.reset_all,
             pos=(window_size[0]-70, 70),
             width=ui_width,
             height=20,
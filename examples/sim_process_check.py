@@ -0,0 +1,56 @@
+"""
+Process mode check for the slime simulation in sim_example.py.
+
+Runs the simulation in an UpdateProcess, as the App does, and changes the
+number of bots and groups through the controls after the local simulation
+has adopted read-only state views from a frame. Both changes are applied
+to the local simulation too, so they must not write to those views. Then
+waits for a frame of the worker that reflects the changes.
+
+Usage: python sim_process_check.py
+"""
+
+import time
+from pygametools.gui.process import UpdateProcess
+from sim_example import Simulation
+
+
+STATE_ATTRS = ('bot_pos', 'group_trails', 'group_col', 'live_tiles')
+
+
+def wait_for_frame(update_process, condition=lambda: True, timeout=60):
+    """Poll the update process until a frame is adopted that meets condition."""
+    start = time.time()
+    while not (update_process.poll() and condition()):
+        if time.time() - start > timeout:
+            raise TimeoutError('no matching frame from the update process')
+        time.sleep(0.05)
+
+
+def main():
+    simulation = Simulation(env_dim=(64, 64), window_size=(128, 128))
+    simulation.num_bot_groups = 3
+    simulation.num_bots = 50
+    simulation.reset_pos()
+
+    update_process = UpdateProcess(simulation, state_attrs=STATE_ATTRS)
+    controls = update_process.params
+    update_process.start()
+    try:
+        wait_for_frame(update_process)
+        assert not simulation.group_trails.flags.writeable
+
+        for num_bots, num_bot_groups in ((40, 3), (40, 2), (60, 4)):
+            controls.num_bots = num_bots
+            controls.num_bot_groups = num_bot_groups
+            wait_for_frame(update_process, lambda: (
+                simulation.bot_pos.shape[0] == num_bots
+                and simulation.group_trails.shape[0] == num_bot_groups))
+            assert simulation.group_col.shape[0] == num_bot_groups
+    finally:
+        update_process.stop()
+    print('process mode ok')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+"""
+Headless parameter sweep for the slime simulation in sim_example.py.
+
+Runs each parameter set for a number of steps on a process pool, without a
+pygame window. Every run is seeded, so it can be reproduced (and watched)
+by creating a Simulation with the same seed and parameters. Per run, the
+trail metrics and thumbnail frames are written to the output directory,
+and all metrics are collected in results.json.
+
+Usage: python sim_sweep.py [output_dir]
+"""
+
+import pygame
+import numpy as np
+import numba
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+import json
+import os
+import sys
+from sim_example import Simulation, composite_trails
+
+
+def grid(**values):
+    """
+    Return the parameter sets of a grid over all combinations of the given
+    values, e.g. grid(decay=(0.1, 0.2), avoidance=(0.5, 0.75)).
+    """
+    names = list(values)
+    return [dict(zip(names, combination)) for combination in product(*values.values())]
+
+
+def random_sets(num_sets, seed=0, **ranges):
+    """
+    Return num_sets parameter sets with values drawn uniformly from the given
+    (min, max) ranges, e.g. random_sets(10, decay=(0.05, 0.3)).
+    """
+    rng = np.random.default_rng(seed)
+    return [
+        {name: float(rng.uniform(*dom)) for name, dom in ranges.items()}
+        for _ in range(num_sets)]
+
+
+def trail_metrics(group_trails, threshold=0.05):
+    """
+    Summary metrics of the group trails:
+        - coverage: fraction of cells where the total trail exceeds threshold.
+        - entropy: Shannon entropy of the total trail, normalized to [0, 1]
+          (1 means evenly spread over all cells).
+        - overlap: per group, the fraction of its covered cells that are also
+          covered by another group.
+    """
+    total = group_trails.sum(axis=0)
+    coverage = float((total > threshold).mean())
+
+    p = total.ravel() / total.sum() if total.sum() > 0 else np.zeros(total.size)
+    p = p[p > 0]
+    entropy = float(-(p * np.log(p)).sum() / np.log(total.size)) if p.size else 0.0
+
+    covered = group_trails > threshold
+    num_covering = covered.sum(axis=0)
+    overlap = [
+        float((num_covering[group] > 1).sum() / max(1, group.sum()))
+        for group in covered]
+
+    return {'coverage': coverage, 'entropy': entropy, 'overlap': overlap}
+
+
+def save_thumbnail(simulation, path, size=128):
+    """
+    Composite the trails as in Simulation.draw, at full brightness and
+    without bot accents, and save a scaled PNG.
+    """
+    pixels = np.zeros((*simulation.env_dim, 3), dtype=np.uint8)
+    composite_trails(
+        pixels, simulation.group_trails, simulation.group_col / simulation.trail_scale,
+        simulation.bot_pos,
+        0.0, 1.0, simulation.live_tiles, np.zeros_like(simulation.live_tiles))
+    surface = pygame.surfarray.make_surface(pixels)
+    pygame.image.save(pygame.transform.smoothscale(surface, (size, size)), path)
+
+
+def run(run_id, params, seed, out_dir, num_steps=500, env_dim=(250, 250),
+        num_bots=5000, num_bot_groups=3, num_thumbnails=4, dtype='float64'):
+    """
+    Run one seeded simulation with the given parameters for num_steps steps,
+    with trails of the given dtype. Thumbnails are saved at num_thumbnails
+    evenly spaced steps. Returns the run summary with the metrics of the last
+    step.
+    """
+    run_dir = os.path.join(out_dir, f'run_{run_id:04d}')
+    os.makedirs(run_dir, exist_ok=True)
+
+    simulation = Simulation(env_dim, window_size=env_dim, seed=seed, dtype=dtype)
+    simulation.num_bot_groups = num_bot_groups
+    simulation.num_bots = num_bots
+    for name, val in params.items():
+        setattr(simulation, name, val)
+
+    thumbnail_steps = set(np.linspace(0, num_steps, num_thumbnails + 1, dtype=int)[1:])
+    for step in range(1, num_steps + 1):
+        simulation.update()
+        if step in thumbnail_steps:
+            save_thumbnail(simulation, os.path.join(run_dir, f'step_{step:06d}.png'))
+
+    summary = {
+        'run_id': run_id, 'seed': seed, 'params': params, 'num_steps': num_steps,
+        **trail_metrics(simulation.group_trails / simulation.trail_scale)}
+    with open(os.path.join(run_dir, 'metrics.json'), 'w') as file:
+        json.dump(summary, file, indent=2)
+    return summary
+
+
+def _init_worker():
+    # One process per core: numba kernels should not spawn threads of their own
+    numba.set_num_threads(1)
+
+
+def sweep(param_sets, out_dir, seed=0, max_workers=None, **run_kwargs):
+    """
+    Run all parameter sets on a process pool. Run i is seeded with seed + i.
+    Kwargs are passed to run(). Returns the run summaries, which are also
+    written to results.json in out_dir.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=mp.get_context('spawn'),
+            initializer=_init_worker) as executor:
+        futures = [
+            executor.submit(run, i, params, seed + i, out_dir, **run_kwargs)
+            for i, params in enumerate(param_sets)]
+        results = [future.result() for future in futures]
+
+    with open(os.path.join(out_dir, 'results.json'), 'w') as file:
+        json.dump(results, file, indent=2)
+    return results
+
+
+def main():
+    out_dir = sys.argv[1] if len(sys.argv) > 1 else 'sweep_results'
+
+    param_sets = grid(
+        decay=(0.05, 0.2),
+        avoidance=(0.25, 0.75),
+        angle_nudge=(0.3, 0.9))
+    for params in param_sets:
+        params.update(blur_factor=0.25, bot_speed=2, randomness=0.1)
+
+    results = sweep(param_sets, out_dir, num_steps=300)
+    for result in sorted(results, key=lambda result: -result['entropy']):
+        print(
+            f"run {result['run_id']:4d}  coverage {result['coverage']:.3f}  "
+            f"entropy {result['entropy']:.3f}  {result['params']}")
+
+
+if __name__ == '__main__':
+    main()
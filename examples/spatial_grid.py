@@ -0,0 +1,243 @@
+"""
+Uniform-grid spatial hash for neighbour queries over agent positions.
+
+Agents are kept in doubly linked lists, one per grid cell. Each step, only
+agents that moved to another cell are relinked, so updating the grid costs
+one cell computation per agent. Radius queries only visit the cells that
+overlap the query circle; k-nearest queries search rings of cells around
+the query point until no unvisited cell can hold a closer agent.
+"""
+
+import numpy as np
+from numba import jit, prange
+from math import floor, sqrt
+
+
+@jit(nopython=True)
+def cell_index(x, y, cell_size, num_cells_x, num_cells_y):
+    """Index of the cell that contains (x, y), clamped to the grid."""
+    i = min(num_cells_x - 1, max(0, int(floor(x / cell_size))))
+    j = min(num_cells_y - 1, max(0, int(floor(y / cell_size))))
+    return i * num_cells_y + j
+
+
+@jit(nopython=True)
+def link_all(pos, cell_size, num_cells_x, num_cells_y, head, next_, prev, cell):
+    """Rebuild all cell lists from scratch."""
+    head[:] = -1
+    for b in range(pos.shape[0]):
+        c = cell_index(pos[b, 0], pos[b, 1], cell_size, num_cells_x, num_cells_y)
+        cell[b] = c
+        prev[b] = -1
+        next_[b] = head[c]
+        if head[c] >= 0:
+            prev[head[c]] = b
+        head[c] = b
+
+
+@jit(nopython=True)
+def relink_moved(pos, cell_size, num_cells_x, num_cells_y, head, next_, prev, cell):
+    """
+    Move agents whose cell changed to the list of their new cell. Returns
+    the number of moved agents.
+    """
+    num_moved = 0
+    for b in range(pos.shape[0]):
+        c = cell_index(pos[b, 0], pos[b, 1], cell_size, num_cells_x, num_cells_y)
+        if c == cell[b]:
+            continue
+        num_moved += 1
+
+        # Unlink from the old cell
+        if prev[b] >= 0:
+            next_[prev[b]] = next_[b]
+        else:
+            head[cell[b]] = next_[b]
+        if next_[b] >= 0:
+            prev[next_[b]] = prev[b]
+
+        # Link at the front of the new cell
+        cell[b] = c
+        prev[b] = -1
+        next_[b] = head[c]
+        if head[c] >= 0:
+            prev[head[c]] = b
+        head[c] = b
+    return num_moved
+
+
+@jit(nopython=True)
+def query_radius(pos, cell_size, num_cells_x, num_cells_y, head, next_, x, y, radius, out):
+    """
+    Write the indices of all agents within radius of (x, y) to out. Returns
+    the number of indices written.
+    """
+    i_lo = max(0, int(floor((x - radius) / cell_size)))
+    i_hi = min(num_cells_x - 1, int(floor((x + radius) / cell_size)))
+    j_lo = max(0, int(floor((y - radius) / cell_size)))
+    j_hi = min(num_cells_y - 1, int(floor((y + radius) / cell_size)))
+    r2 = radius * radius
+    num_found = 0
+
+    for i in range(i_lo, i_hi + 1):
+        for j in range(j_lo, j_hi + 1):
+            b = head[i * num_cells_y + j]
+            while b >= 0:
+                dx = pos[b, 0] - x
+                dy = pos[b, 1] - y
+                if dx * dx + dy * dy <= r2:
+                    out[num_found] = b
+                    num_found += 1
+                b = next_[b]
+    return num_found
+
+
+@jit(nopython=True)
+def count_radius(pos, cell_size, num_cells_x, num_cells_y, head, next_, x, y, radius):
+    """Number of agents within radius of (x, y)."""
+    i_lo = max(0, int(floor((x - radius) / cell_size)))
+    i_hi = min(num_cells_x - 1, int(floor((x + radius) / cell_size)))
+    j_lo = max(0, int(floor((y - radius) / cell_size)))
+    j_hi = min(num_cells_y - 1, int(floor((y + radius) / cell_size)))
+    r2 = radius * radius
+    num_found = 0
+
+    for i in range(i_lo, i_hi + 1):
+        for j in range(j_lo, j_hi + 1):
+            b = head[i * num_cells_y + j]
+            while b >= 0:
+                dx = pos[b, 0] - x
+                dy = pos[b, 1] - y
+                if dx * dx + dy * dy <= r2:
+                    num_found += 1
+                b = next_[b]
+    return num_found
+
+
+@jit(nopython=True, parallel=True)
+def query_radius_all(pos, points, cell_size, num_cells_x, num_cells_y, head, next_, radius):
+    """
+    Radius query for every point, in parallel. Returns CSR (offsets, indices):
+    the neighbours of point p are indices[offsets[p]:offsets[p+1]].
+    """
+    num_points = points.shape[0]
+    counts = np.zeros(num_points, dtype=np.int64)
+    for p in prange(num_points):
+        counts[p] = count_radius(
+            pos, cell_size, num_cells_x, num_cells_y, head, next_,
+            points[p, 0], points[p, 1], radius)
+
+    offsets = np.zeros(num_points + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(counts)
+    indices = np.empty(offsets[-1], dtype=np.int64)
+    for p in prange(num_points):
+        query_radius(
+            pos, cell_size, num_cells_x, num_cells_y, head, next_,
+            points[p, 0], points[p, 1], radius, indices[offsets[p]:offsets[p+1]])
+    return offsets, indices
+
+
+@jit(nopython=True)
+def query_knn(pos, cell_size, num_cells_x, num_cells_y, head, next_, x, y, k):
+    """
+    Indices of the (up to) k agents nearest to (x, y), nearest first. Rings
+    of cells around the query cell are searched until the k-th nearest
+    distance is smaller than the distance to the next ring.
+    """
+    best_idx = np.full(k, -1, dtype=np.int64)
+    best_d2 = np.full(k, np.inf)
+    num_found = 0
+    ci = min(num_cells_x - 1, max(0, int(floor(x / cell_size))))
+    cj = min(num_cells_y - 1, max(0, int(floor(y / cell_size))))
+    max_ring = max(ci, num_cells_x - 1 - ci, cj, num_cells_y - 1 - cj)
+
+    for ring in range(max_ring + 1):
+        for i in range(max(0, ci - ring), min(num_cells_x, ci + ring + 1)):
+            for j in range(max(0, cj - ring), min(num_cells_y, cj + ring + 1)):
+
+                # Only the cells on the border of the ring are new
+                if max(abs(i - ci), abs(j - cj)) != ring:
+                    continue
+                b = head[i * num_cells_y + j]
+                while b >= 0:
+                    dx = pos[b, 0] - x
+                    dy = pos[b, 1] - y
+                    d2 = dx * dx + dy * dy
+
+                    # Insertion into the sorted k best
+                    if num_found < k or d2 < best_d2[k - 1]:
+                        s = min(num_found, k - 1)
+                        while s > 0 and best_d2[s - 1] > d2:
+                            best_d2[s] = best_d2[s - 1]
+                            best_idx[s] = best_idx[s - 1]
+                            s -= 1
+                        best_d2[s] = d2
+                        best_idx[s] = b
+                        num_found = min(k, num_found + 1)
+                    b = next_[b]
+
+        # Agents in unvisited rings are at least ring * cell_size away
+        if num_found == k and sqrt(best_d2[k - 1]) <= ring * cell_size:
+            break
+
+    return best_idx[:num_found]
+
+
+class SpatialGrid:
+
+    def __init__(self, env_dim, cell_size=8):
+        """
+        Uniform-grid spatial hash over (N, 2) positions within env_dim.
+
+        Call update() with the current positions every step. The grid is
+        rebuilt when the number of agents changes, or after invalidate()
+        (e.g. when agents were reordered); otherwise only agents that moved
+        to another cell are relinked.
+        """
+        self.cell_size = float(cell_size)
+        self.num_cells_x = max(1, int(np.ceil(env_dim[0] / cell_size)))
+        self.num_cells_y = max(1, int(np.ceil(env_dim[1] / cell_size)))
+        self.head = np.full(self.num_cells_x * self.num_cells_y, -1, dtype=np.int64)
+        self.next = np.zeros(0, dtype=np.int64)
+        self.prev = np.zeros(0, dtype=np.int64)
+        self.cell = np.zeros(0, dtype=np.int64)
+        self.pos = np.zeros((0, 2))
+        self._stale = True
+
+    def _grid_args(self):
+        return self.cell_size, self.num_cells_x, self.num_cells_y, self.head, self.next
+
+    def invalidate(self):
+        """Rebuild the grid at the next update."""
+        self._stale = True
+
+    def update(self, pos):
+        """Track the new positions. Returns the number of relinked agents."""
+        self.pos = pos
+        if self._stale or pos.shape[0] != self.cell.shape[0]:
+            num = pos.shape[0]
+            self.next = np.empty(num, dtype=np.int64)
+            self.prev = np.empty(num, dtype=np.int64)
+            self.cell = np.empty(num, dtype=np.int64)
+            link_all(
+                pos, self.cell_size, self.num_cells_x, self.num_cells_y,
+                self.head, self.next, self.prev, self.cell)
+            self._stale = False
+            return num
+        return relink_moved(
+            pos, self.cell_size, self.num_cells_x, self.num_cells_y,
+            self.head, self.next, self.prev, self.cell)
+
+    def query_radius(self, center, radius):
+        """Indices of the agents within radius of center."""
+        out = np.empty(self.pos.shape[0], dtype=np.int64)
+        num_found = query_radius(self.pos, *self._grid_args(), center[0], center[1], radius, out)
+        return out[:num_found]
+
+    def query_radius_all(self, points, radius):
+        """CSR (offsets, indices) of the agents within radius of each point."""
+        return query_radius_all(self.pos, np.asarray(points, dtype=float), *self._grid_args(), radius)
+
+    def query_knn(self, center, k):
+        """Indices of the k agents nearest to center, nearest first."""
+        return query_knn(self.pos, *self._grid_args(), center[0], center[1], k)
@@ -40,23 +40,25 @@ class Color:
     CYAN3 = (150, 220, 230)
 
     @staticmethod
-    def random_vibrant():
+    def random_vibrant(rng=None):
         """
-        Return one random vibrant RGB color.
+        Return one random vibrant RGB color. Draws from the given
+        np.random.Generator, or from the global numpy random state.
         """
         while True:
-            rgb = np.random.randint(0, 256, 3)
+            rgb = np.random.randint(0, 256, 3) if rng is None else rng.integers(0, 256, 3)
             dif = abs(rgb - np.roll(rgb, 1)).sum()
             if dif > 350:
                 return rgb
 
     @staticmethod
-    def random_dull():
+    def random_dull(rng=None):
         """
-        Return one random dull RGB color.
+        Return one random dull RGB color. Draws from the given
+        np.random.Generator, or from the global numpy random state.
         """
         while True:
-            rgb = np.random.randint(0, 256, 3)
+            rgb = np.random.randint(0, 256, 3) if rng is None else rng.integers(0, 256, 3)
             dif = abs(rgb - np.roll(rgb, 1)).sum()
             tot = rgb.sum()
             if (80 < dif < 150) and (200 < tot < 500):
@@ -88,6 +90,14 @@ class ColorGradient:
         value = min(1, max(0, value))
         return self.c1 + self.width * value
 
+    def get_colors(self, values):
+        """
+        Vectorized get_color. Returns an array of shape (n, 3) with one
+        color for each of the n given values.
+        """
+        values = np.clip(np.asarray(values, dtype=float), 0, 1)
+        return self.c1 + self.width * values[:, np.newaxis]
+
 
 def colorpreview():
     """
@@ -1,12 +1,14 @@
 import pygame
 import numpy as np
 import time
+import threading
 from abc import ABC, abstractmethod
 from .file_manager import load_theme
 import sys
 from importlib.resources import files
 from enum import Enum
 from pygametools.fonts import load_font
+from .process import UpdateProcess
 
 
 class State(Enum):
@@ -72,7 +74,8 @@ class Application(ABC):
             window_size: tuple,
             tick_len: float=1/30,
             name: str='Application',
-            theme_name: str='default'):
+            theme_name: str='default',
+            threaded_render: bool=False):
         """
         Handles the main Pygame window, events, and ticks.
 
@@ -82,6 +85,12 @@ class Application(ABC):
             Duration in seconds for a programm tick.
         window_size : array, tuple, list
             Dimensions (x,y) of Pygame window.
+        threaded_render : bool
+            Draw on a separate render thread, so that event handling and
+            update() do not wait for drawing. Each tick, the main thread
+            publishes the result of snapshot(), and the render thread draws
+            the latest published snapshot. Snapshots that are published while
+            a frame is being drawn are dropped, except for the latest.
 
         """
         # Pygame init and window settings
@@ -110,6 +119,18 @@ class Application(ABC):
         self.pan_offset = np.array([0,0])
         self.zoom = 1
 
+        # Optional worker process that runs a simulation update
+        self.update_process = None
+
+        # Threaded rendering: the latest published snapshot is drawn by the
+        # render thread and available to draw() as self.draw_snapshot
+        self.threaded_render = threaded_render
+        self.draw_snapshot = None
+        self._render_thread = None
+        self._render_cond = threading.Condition()
+        self._pending_snapshot = None
+        self._render_stop = False
+
         # Defining screen
         self.screen = pygame.display.set_mode(window_size)
 
@@ -124,6 +145,66 @@ class Application(ABC):
         mouse_pos_arr = np.array(pygame.mouse.get_pos())
         return tuple(((mouse_pos_arr - self.pan_offset) / self.zoom).astype(int))
 
+    def run_in_process(self, obj, state_attrs):
+        """
+        Run the update() method of obj in a worker process, while this
+        process handles events and drawing. Each tick, obj is updated with the
+        latest state computed by the worker; see UpdateProcess.
+
+        Parameters
+        ----------
+        obj : object
+            Picklable object with an update() method, e.g. a simulation.
+        state_attrs : tuple
+            Names of the array attributes of obj that are needed for drawing.
+
+        Returns
+        -------
+        update_process : UpdateProcess
+            Use update_process.params instead of obj for GUI elements, so
+            their changes are forwarded to the worker.
+
+        """
+        self.update_process = UpdateProcess(obj, state_attrs)
+        self.update_process.start()
+        return self.update_process
+
+    def snapshot(self):
+        """
+        Return the state that draw() needs, for threaded rendering. The main
+        thread keeps updating after publishing it, so it should not share
+        arrays that update() changes in place. Defaults to None.
+        """
+        return None
+
+    def _render_loop(self):
+        """
+        Render thread loop. Waits for a published snapshot and draws it.
+        """
+        while True:
+            with self._render_cond:
+                while self._pending_snapshot is None and not self._render_stop:
+                    self._render_cond.wait()
+                if self._render_stop:
+                    return
+                # Snapshots are wrapped in a tuple, as None is a valid snapshot
+                (self.draw_snapshot,), self._pending_snapshot = self._pending_snapshot, None
+            self.call_draw()
+
+    def request_draw(self):
+        """
+        Draw the current state. In threaded render mode, the current snapshot
+        is published to the render thread instead, replacing any snapshot that
+        has not been drawn yet.
+        """
+        if self._render_thread is None:
+            self.call_draw()
+            return
+        snapshot = (self.snapshot(),)
+        with self._render_cond:
+            self._pending_snapshot = snapshot
+            self._render_cond.notify()
+
     def set_theme(self):
         """
         Reloads all theme colors. Used at init or called externally when
@@ -172,10 +253,13 @@ class Application(ABC):
         """
         running = True
 
+        if self.threaded_render:
+            self._render_stop = False
+            self._render_thread = threading.Thread(target=self._render_loop, daemon=True)
+            self._render_thread.start()
 
         while running:
             self.ticker.next_tick()
-            self.screen.fill(self.background_color)
 
             # event handling and mouse info
             events = [event for event in pygame.event.get()]
@@ -195,16 +279,33 @@ class Application(ABC):
             elif pygame.BUTTON_MIDDLE in self.key_events['down']:
                 self.mouse_pan()
 
-            # Application update
+            # Application update, with the latest state from the worker process
+            if self.update_process is not None:
+                self.update_process.poll()
             self.update()
 
             # Draw everything to screen
-            self.call_draw()
+            self.request_draw()
 
+        self.stop_render_thread()
+        if self.update_process is not None:
+            self.update_process.stop()
         pygame.display.quit()
         pygame.quit()
         sys.exit()
 
+    def stop_render_thread(self):
+        """
+        Stop the render thread after it finishes its current frame.
+        """
+        if self._render_thread is None:
+            return
+        with self._render_cond:
+            self._render_stop = True
+            self._render_cond.notify()
+        self._render_thread.join()
+        self._render_thread = None
+
     def call_draw(self):
         """
         Cals all drawing methods. Called from self.run, but can also be called
@@ -238,7 +339,7 @@ class Application(ABC):
         while True:
             mouse_current = np.array(pygame.mouse.get_pos())
             self.pan_offset = initial_offset + mouse_current - mouse_start
-            self.call_draw()
+            self.request_draw()
             for event in pygame.event.get():
                 if event.type == pygame.MOUSEBUTTONUP:
                     return
@@ -0,0 +1,211 @@
+import multiprocessing as mp
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+
+
+# Byte alignment of the state arrays within a shared memory buffer
+ALIGNMENT = 64
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _run_worker(conn, obj, state_attrs):
+    """
+    Worker process loop. Steps obj.update() and copies the state arrays of
+    each step into one of two shared memory buffers. A buffer is only
+    written when the main process has released it, so the main process can
+    read the previous step while the next one is computed.
+    """
+    buffers = [None, None]
+    free = [0, 1]
+    update_kwargs = {}
+
+    try:
+        while True:
+
+            # Handle messages; block until a buffer is released if none is free
+            while conn.poll() or not free:
+                msg = conn.recv()
+                if msg[0] == 'stop':
+                    return
+                elif msg[0] == 'set':
+                    setattr(obj, msg[1], msg[2])
+                elif msg[0] == 'call':
+                    getattr(obj, msg[1])(*msg[2])
+                elif msg[0] == 'update_kwargs':
+                    update_kwargs = msg[1]
+                elif msg[0] == 'release':
+                    free.append(msg[1])
+
+            obj.update(**update_kwargs)
+
+            # Layout of the state arrays in the buffer
+            arrays = [np.asarray(getattr(obj, name)) for name in state_attrs]
+            specs, offset = [], 0
+            for name, arr in zip(state_attrs, arrays):
+                specs.append((name, arr.shape, arr.dtype.str, offset))
+                offset = _align(offset + arr.nbytes)
+
+            # Grow the buffer when the state no longer fits (e.g. more bots)
+            b = free.pop(0)
+            if buffers[b] is None or buffers[b].size < offset:
+                if buffers[b] is not None:
+                    buffers[b].close()
+                    buffers[b].unlink()
+                buffers[b] = SharedMemory(create=True, size=max(ALIGNMENT, 2 * offset))
+
+            for (name, shape, dtype, start), arr in zip(specs, arrays):
+                np.ndarray(shape, dtype, buffers[b].buf, start)[...] = arr
+            conn.send(('frame', b, buffers[b].name, specs))
+    finally:
+        for shm in buffers:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+
+class ParamProxy:
+
+    def __init__(self, process):
+        """
+        Stand-in for the simulation object of an UpdateProcess, to pass to
+        GUI elements. Attribute changes are applied to the local object and
+        forwarded to the worker process. Methods are only called in the
+        worker process; their effect on the state arrays shows up with the
+        next frame.
+        """
+        object.__setattr__(self, '_process', process)
+
+    def __getattr__(self, name):
+        process = object.__getattribute__(self, '_process')
+        val = getattr(process.obj, name)
+        if callable(val):
+            return lambda *args: process.call(name, *args)
+        return val
+
+    def __setattr__(self, name, val):
+        process = object.__getattribute__(self, '_process')
+        process.set_param(name, val)
+
+
+class UpdateProcess:
+
+    def __init__(self, obj, state_attrs):
+        """
+        Runs the update() method of a simulation object in a worker process.
+
+        The worker gets a copy of obj and steps it continuously. After each
+        step, the arrays in state_attrs are published through one of two
+        shared memory buffers. poll() adopts the latest published step by
+        replacing the state attributes of the local obj with read-only views
+        on its buffer, so the local obj can be drawn while the worker computes
+        the next step. Parameter changes and method calls are forwarded to
+        the worker as messages, see set_param, call and params.
+
+        Parameters
+        ----------
+        obj : object
+            Picklable object with an update() method, e.g. a simulation.
+        state_attrs : tuple
+            Names of the array attributes that update() changes and that are
+            needed for drawing.
+
+        """
+        self.obj = obj
+        self.state_attrs = tuple(state_attrs)
+        self.params = ParamProxy(self)
+
+        self._update_kwargs = {}
+        self._conn = None
+        self._process = None
+        self._shm = [None, None]
+        self._held = None
+
+    @property
+    def running(self):
+        return self._process is not None and self._process.is_alive()
+
+    def start(self):
+        """
+        Start the worker process. The spawn start method is used, because
+        forking a process that already runs (numba) threads is unsafe.
+        """
+        ctx = mp.get_context('spawn')
+        self._conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(
+            target=_run_worker, args=(child_conn, self.obj, self.state_attrs),
+            daemon=True)
+        self._process.start()
+        child_conn.close()
+
+    def stop(self):
+        """Stop the worker process and free the shared memory buffers."""
+        if self._process is None:
+            return
+        self._conn.send(('stop',))
+        self._process.join()
+        self._process = None
+        for shm in self._shm:
+            if shm is not None:
+                try:
+                    shm.close()
+                except BufferError:
+                    # Views on the buffer are still referenced
+                    pass
+        self._shm = [None, None]
+        self._held = None
+
+    def set_param(self, name, val):
+        """Set an attribute on the local object and in the worker process."""
+        setattr(self.obj, name, val)
+        if self._conn is not None:
+            self._conn.send(('set', name, val))
+
+    def call(self, name, *args):
+        """Call a method of the object in the worker process."""
+        self._conn.send(('call', name, args))
+
+    def set_update_kwargs(self, **kwargs):
+        """Set the keyword arguments that the worker passes to update()."""
+        if kwargs != self._update_kwargs:
+            self._update_kwargs = kwargs
+            self._conn.send(('update_kwargs', kwargs))
+
+    def poll(self):
+        """
+        Adopt the latest step published by the worker, if any. Steps that
+        were published in between are skipped. Returns True when a new step
+        was adopted.
+        """
+        latest = None
+        while self._conn.poll():
+            msg = self._conn.recv()
+            if latest is not None:
+                self._conn.send(('release', latest[1]))
+            latest = msg
+
+        if latest is None:
+            return False
+        _, b, shm_name, specs = latest
+
+        # Attach to the buffer, which is replaced by the worker when it grows
+        if self._shm[b] is None or self._shm[b].name != shm_name:
+            if self._shm[b] is not None:
+                try:
+                    self._shm[b].close()
+                except BufferError:
+                    pass
+            self._shm[b] = SharedMemory(name=shm_name)
+
+        for name, shape, dtype, offset in specs:
+            view = np.ndarray(shape, dtype, self._shm[b].buf, offset)
+            view.flags.writeable = False
+            setattr(self.obj, name, view)
+
+        # Release the previously held buffer for writing
+        if self._held is not None:
+            self._conn.send(('release', self._held))
+        self._held = b
+        return True
@@ -0,0 +1 @@
+from .loaders import load_delimited
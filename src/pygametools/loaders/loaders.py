@@ -0,0 +1,114 @@
+import os
+from glob import escape, glob
+from hashlib import sha1
+from itertools import islice
+import numpy as np
+import numpy.typing as npt
+
+
+def _detect_delimiter(line: str) -> str | None:
+    """
+    Return the most likely delimiter of a line of delimited text. Returns
+    None (any whitespace) when no ';', ',' or tab is found.
+    """
+    counts = {delimiter: line.count(delimiter) for delimiter in (';', ',', '\t')}
+    delimiter, count = max(counts.items(), key=lambda item: item[1])
+    return delimiter if count > 0 else None
+
+
+def _cache_version(path: str) -> str:
+    """Return the size and modification time of a source file as a string."""
+    stat = os.stat(path)
+    return f'{stat.st_size}-{stat.st_mtime_ns}'
+
+
+def _cache_path(path: str, delimiter: str | None, dtype: npt.DTypeLike) -> str:
+    """
+    Return the sidecar .npy path for a source file. The path contains the
+    source size and modification time, so a changed source gets a new cache,
+    and a hash of the delimiter and dtype, so loading the same source with
+    other options does not return an array parsed with the first ones.
+    """
+    options = sha1(repr((delimiter, np.dtype(dtype).str)).encode()).hexdigest()[:8]
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, f'.{name}.{_cache_version(path)}-{options}.npy')
+
+
+def load_delimited(
+        path: str | os.PathLike,
+        delimiter: str | None = None,
+        dtype: npt.DTypeLike = float,
+        chunk_rows: int = 100_000,
+        cache: bool = True,
+        mmap_mode: str | None = 'r') -> np.ndarray:
+    """
+    Load a delimited text file (csv, ssv, tsv) into a 2d NumPy array.
+
+    The file is parsed in chunks of chunk_rows lines, so the text never has
+    to be in memory at once. A UTF-8 BOM is skipped. When cache is True, the
+    parsed array is saved as a hidden sidecar .npy file next to the source,
+    keyed by the source size and modification time, the delimiter and the
+    dtype, and the sidecar is returned loaded with mmap_mode. Later calls
+    load the sidecar instead of parsing the text again, so the first and
+    later calls return the same kind of array. Without cache, or when the
+    sidecar can not be written, the parsed in-memory array is returned. A
+    sidecar that can not be loaded is removed and the text parsed again.
+
+    The result can be passed directly to the plot types: as an image array
+    (e.g. ArrayImage.set_image_grayscale) or, with two columns, as xy data
+    (e.g. ScatterPlot.add_data, XYDataSource).
+
+    Args:
+        path: Path of the text file.
+        delimiter: Column delimiter. Detected from the first line if None.
+        dtype: Data type of the returned array.
+        chunk_rows: Number of lines parsed at once.
+        cache: Whether to read and write the sidecar .npy cache.
+        mmap_mode: Mode used to load the sidecar, see np.load. The default
+            'r' returns a read-only memory map; None loads it into memory.
+    """
+    path = os.fspath(path)
+    sidecar = _cache_path(path, delimiter, dtype)
+    if cache and os.path.exists(sidecar):
+        try:
+            return np.load(sidecar, mmap_mode=mmap_mode)
+        except (OSError, ValueError, EOFError):
+            # Unreadable sidecar (e.g. left by a crashed save): parse again
+            try:
+                os.remove(sidecar)
+            except OSError:
+                pass
+
+    chunks = []
+    with open(path, 'r', encoding='utf-8-sig') as file:
+        while True:
+            lines = [line for line in islice(file, chunk_rows) if line.strip()]
+            if not lines:
+                break
+            if delimiter is None:
+                delimiter = _detect_delimiter(lines[0])
+            chunks.append(np.loadtxt(lines, delimiter=delimiter, dtype=dtype, ndmin=2))
+    arr = np.vstack(chunks) if chunks else np.empty((0, 0), dtype=dtype)
+
+    if cache:
+        try:
+            # Remove caches of previous versions of the source (of any options)
+            prefix = sidecar.rsplit('.', 2)[0]
+            version = _cache_version(path)
+            for cached_path in glob(escape(prefix) + '.*-*.npy'):
+                if not cached_path[len(prefix) + 1:].startswith(version + '-'):
+                    os.remove(cached_path)
+            # Save under a temporary name and then rename, so other processes
+            # never load a partially written sidecar
+            tmp_path = f'{sidecar}.{os.getpid()}.tmp'
+            try:
+                with open(tmp_path, 'wb') as file:
+                    np.save(file, arr)
+                os.replace(tmp_path, sidecar)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        except OSError:
+            return arr
+        return np.load(sidecar, mmap_mode=mmap_mode)
+    return arr
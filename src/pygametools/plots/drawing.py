@@ -1,4 +1,6 @@
+from collections import OrderedDict
 from dataclasses import dataclass
+import weakref
 from .types import MetricCoordinatePair, MetricCoordinateArray, MetricCoordinates, Domain
 from typing import Literal
 import numpy.typing as npt
@@ -119,16 +121,141 @@ class PlotMetrics:
         return self.axes_pos + self.axes_dim
 
 
+class SurfacePool:
+
+    BUCKET_SIZE = 64
+
+    def __init__(self, max_free: int = 4):
+        """
+        Pool of backing surfaces with dimensions rounded up to BUCKET_SIZE.
+
+        Released surfaces are kept (at most max_free per bucket and flags) and
+        handed out again by acquire, so renderers that resize or get replaced
+        reuse pixel memory instead of allocating new surfaces. Views on pooled
+        surfaces are made with view, which tracks them: a released surface
+        stays pending until all its views are dropped, so a view that is
+        still held never aliases a newly acquired surface.
+        """
+        self.max_free = max_free
+        self._free: dict[tuple[int, int, int], list[pygame.Surface]] = {}
+        self._pending: list[pygame.Surface] = []
+        self._views: weakref.WeakKeyDictionary[pygame.Surface, list[weakref.ref]] = (
+            weakref.WeakKeyDictionary())
+
+    def capacity(self, size: npt.ArrayLike) -> tuple[int, int]:
+        """Round a (w, h) size up to the bucket size."""
+        b = self.BUCKET_SIZE
+        return tuple(int(-(-max(1, s) // b) * b) for s in size)
+
+    def acquire(self, size: npt.ArrayLike, flags: int = 0) -> pygame.Surface:
+        """Return a surface with the bucket capacity for size."""
+        self._collect()
+        capacity = self.capacity(size)
+        free = self._free.get((*capacity, flags))
+        if free:
+            return free.pop()
+        return pygame.Surface(capacity, flags)
+
+    def view(self, surface: pygame.Surface, size: npt.ArrayLike) -> pygame.Surface:
+        """Return a tracked subsurface view of size at the top left of surface."""
+        view = surface.subsurface((0, 0, *size))
+        refs = [ref for ref in self._views.get(surface, []) if ref() is not None]
+        refs.append(weakref.ref(view))
+        self._views[surface] = refs
+        return view
+
+    def release(self, surface: pygame.Surface):
+        """
+        Return a surface acquired from this pool for reuse. It is handed out
+        again once all views on it have been dropped.
+        """
+        self._pending.append(surface)
+        self._collect()
+
+    def _collect(self):
+        """Move pending surfaces without live views to the free lists."""
+        pending = []
+        for surface in self._pending:
+            if any(ref() is not None for ref in self._views.get(surface, [])):
+                pending.append(surface)
+                continue
+            self._views.pop(surface, None)
+            free = self._free.setdefault((*surface.get_size(), surface.get_flags() & pygame.SRCALPHA), [])
+            if len(free) < self.max_free:
+                free.append(surface)
+        self._pending = pending
+
+
+# Pool shared by all renderers by default
+surface_pool = SurfacePool()
+
+
 class PlotRenderer:
 
-    def __init__(self, dim: npt.ArrayLike, axes_dim: npt.ArrayLike):
-        self.surface_canvas = pygame.Surface(tuple(np.array(dim, dtype=int)))
-        self.surface_axes = pygame.Surface(tuple(np.array(axes_dim, dtype=int)), pygame.SRCALPHA)
+    # Number of rendered text surfaces kept by text()
+    TEXT_CACHE_SIZE = 256
+
+    def __init__(self, dim: npt.ArrayLike, axes_dim: npt.ArrayLike, pool: SurfacePool | None = None):
+        """
+        Draws plot primitives on a canvas surface and an axes surface.
+
+        Both surfaces are subsurface views of larger backing surfaces taken
+        from a SurfacePool, so resizing only allocates when the backing
+        capacity is exceeded. Rendered text is kept in a small LRU cache, so
+        labels that do not change between frames are rendered only once.
+        """
+        self._pool = pool if pool is not None else surface_pool
+        self._text_cache: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self._backing_canvas: pygame.Surface | None = None
+        self._backing_axes: pygame.Surface | None = None
+        self.resize(dim, axes_dim)
+
+    def _fit(self, backing: pygame.Surface | None, size: npt.ArrayLike, flags: int):
+        """
+        Return a backing surface with capacity for size, and a size view on
+        it. The backing surface is only swapped through the pool when it is
+        too small, or more than four times the area of the needed capacity.
+        """
+        size = tuple(max(0, int(s)) for s in size)
+        capacity = self._pool.capacity(size)
+        if backing is None:
+            too_small = too_large = True
+        else:
+            width, height = backing.get_size()
+            too_small = width < size[0] or height < size[1]
+            too_large = width * height > 4 * capacity[0] * capacity[1]
+        if too_small or too_large:
+            old, backing = backing, self._pool.acquire(size, flags)
+            if old is not None:
+                self._pool.release(old)
+        return backing, self._pool.view(backing, size)
 
     def resize(self, dim: npt.ArrayLike, axes_dim: npt.ArrayLike):
-        """Recreate surfaces when canvas or axes dimensions change."""
-        self.surface_canvas = pygame.Surface(tuple(np.array(dim, dtype=int)))
-        self.surface_axes = pygame.Surface(tuple(np.array(axes_dim, dtype=int)), pygame.SRCALPHA)
+        """Resize the surface views when canvas or axes dimensions change."""
+        # Drop the current views first, so replaced backings that are not
+        # viewed elsewhere return to the pool right away
+        self.surface_canvas = self.surface_axes = None
+        self._backing_canvas, self.surface_canvas = self._fit(
+            self._backing_canvas, dim, 0)
+        self._backing_axes, self.surface_axes = self._fit(
+            self._backing_axes, axes_dim, pygame.SRCALPHA)
+
+    def release(self):
+        """
+        Drop the surface views and return the backing surfaces to the pool
+        when the renderer is discarded.
+        """
+        backings = (self._backing_canvas, self._backing_axes)
+        self._backing_canvas = self._backing_axes = None
+        self.surface_canvas = self.surface_axes = None
+        self._text_cache.clear()
+        for backing in backings:
+            if backing is not None:
+                self._pool.release(backing)
+
+    def __del__(self):
+        if hasattr(self, '_backing_axes'):
+            self.release()
 
     def clear(self, theme: PlotTheme):
         """Reset draw surfaces to background colors before a new frame."""
@@ -157,22 +284,32 @@ class PlotRenderer:
         """
         if not on_axes:
             return self.surface_canvas, np.asarray(pos)
+        return self.surface_axes, self.axes_coords(pos, metrics)
+
+    @staticmethod
+    def axes_coords(pos: npt.ArrayLike, metrics: PlotMetrics) -> npt.NDArray[np.int_]:
+        """
+        Convert a graph coordinate point (2,) or points (N, 2) to pygame
+        coordinates on the axes surface, where (0,0) is the top left of axes.
+        """
+        return PlotRenderer.axes_coords_float(pos, metrics).astype(int)
+
+    @staticmethod
+    def axes_coords_float(pos: npt.ArrayLike, metrics: PlotMetrics) -> npt.NDArray[np.float64]:
+        """
+        Same as axes_coords, without rounding to whole pixels. Points far
+        outside the axes keep their (large) float coordinates.
+        """
+        pos = np.asarray(pos, dtype=float)
 
-        # Compute position of point as a ratio of domains
-        pos = np.asarray(pos)
-        relative_pos = np.array([
-            (pos[0] - metrics.xdom[0]) / metrics.xdom_span,
-            (pos[1] - metrics.ydom[0]) / metrics.ydom_span
-        ])
+        # Compute position of points as a ratio of domains
+        relative_pos = (pos - (metrics.xdom[0], metrics.ydom[0])) / (
+            metrics.xdom_span, metrics.ydom_span)
 
         # Reverse y coordinate (graph y-up --> pygame y-down)
-        if relative_pos.ndim == 2:
-            relative_pos[:,1] = 1 - relative_pos[:,1]
-        else:
-            relative_pos[1] = 1 - relative_pos[1]
+        relative_pos[..., 1] = 1 - relative_pos[..., 1]
 
-        pos_axes = (metrics.axes_dim * relative_pos).astype(int)
-        return self.surface_axes, pos_axes
+        return metrics.axes_dim * relative_pos
 
     def circle(self, on_axes=True):
         raise NotImplementedError
@@ -230,6 +367,17 @@ class PlotRenderer:
         
         draw_surface.blit(tmp, (x - radius, y - radius))
 
+    def points(
+            self,
+            points: npt.ArrayLike,
+            col: tuple,
+            metrics: PlotMetrics,
+            radius: int,
+            alpha: float = 1):
+        """Draw a filled circle for each point in an (N, 2) array of graph-coordinate points."""
+        for xy in np.asarray(points):
+            self.point(xy, col, metrics, radius, alpha)
+
     def polyline(
             self,
             points: npt.ArrayLike,
@@ -239,9 +387,7 @@ class PlotRenderer:
         pts = np.asarray(points, dtype=float)
         if len(pts) < 2:
             return
-        rel_x = (pts[:, 0] - metrics.xdom[0]) / metrics.xdom_span
-        rel_y = 1.0 - (pts[:, 1] - metrics.ydom[0]) / metrics.ydom_span
-        pixel_pts = (np.column_stack([rel_x, rel_y]) * metrics.axes_dim).astype(int).tolist()
+        pixel_pts = self.axes_coords(pts, metrics).tolist()
         pygame.draw.aalines(self.surface_axes, col, False, pixel_pts)
 
     def rect(
@@ -261,6 +407,44 @@ class PlotRenderer:
         if linecol is not None:
             pygame.draw.rect(draw_surface, linecol, rect, width=1)
 
+    def rects(
+            self,
+            pos: npt.ArrayLike,
+            dim: npt.ArrayLike,
+            facecol: tuple,
+            metrics: PlotMetrics):
+        """
+        Fill a rect for each top-left graph-coordinate point in an (N, 2)
+        array, with pygame dimensions given as an (N, 2) array.
+        """
+        for xy, wh in zip(np.asarray(pos), np.asarray(dim)):
+            self.rect(xy, wh, metrics, facecol=facecol)
+
+    def blit(
+            self,
+            surface: pygame.Surface,
+            pos: MetricCoordinates,
+            on_axes: bool = True):
+        """
+        Blit a surface with its top left at pos, given in pygame coordinates
+        of the axes (on_axes == True) or canvas surface.
+        """
+        draw_surface = self.surface_axes if on_axes else self.surface_canvas
+        draw_surface.blit(surface, tuple(np.asarray(pos, dtype=int)))
+
+    def _render_text(self, text: str, font: pygame.font.Font, col: tuple) -> pygame.Surface:
+        """Render text to a surface, reusing the surface from the LRU cache."""
+        key = (text, font, tuple(col))
+        text_block = self._text_cache.get(key)
+        if text_block is None:
+            text_block = font.render(text, True, col)
+            self._text_cache[key] = text_block
+            if len(self._text_cache) > self.TEXT_CACHE_SIZE:
+                self._text_cache.popitem(last=False)
+        else:
+            self._text_cache.move_to_end(key)
+        return text_block
+
     def text(
             self,
             text: str,
@@ -284,7 +468,7 @@ class PlotRenderer:
 
         draw_surface, draw_pos = self.get_surface_pos(pos, on_axes, metrics)
 
-        text_block = font.render(text, True, col)
+        text_block = self._render_text(text, font, col)
         text_rect = text_block.get_rect()
         x, y = draw_pos + offset
 
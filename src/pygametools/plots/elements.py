@@ -3,9 +3,15 @@ import numpy.typing as npt
 from pygametools.plots.types import MetricCoordinatePair, Domain
 from .drawing import PlotTheme, PlotMetrics, PlotRenderer, DrawContext
 from .plot_types import PlotType
+try:
+    from .rasterize import NumbaPlotRenderer
+except ImportError:
+    NumbaPlotRenderer = None
 from pygametools.color import Color
 from abc import ABC, abstractmethod
-from math import floor, log10
+from contextlib import contextmanager
+from functools import lru_cache
+from math import ceil, floor, log10
 from typing import Literal
 import pygame
 
@@ -28,12 +34,22 @@ class Canvas:
             xdom: X-axis domain (min, max) in data coordinates
             ydom: Y-axis domain (min, max) in data coordinates
             kwargs: TODO: find out where kwargs are used and update docstring
+                auto_coalesce: Defer metric change notifications to the next
+                    draw (default True). See batch_update.
+                legend: Legend location, e.g. "upper right" (default). See
+                    Legend.LOCATIONS.
+                backend: "pygame" (default) or "numba". The numba backend
+                    rasterizes plot data with numba kernels and falls back to
+                    "pygame" when numba is not available.
         """
         self._elements: list[Element | PlotType] = []
 
         metrics = PlotMetrics(pos, dim, xdom, ydom)
         theme = PlotTheme(**kwargs)
-        renderer = PlotRenderer(metrics.dim, metrics.axes_dim)
+        renderer_cls = PlotRenderer
+        if kwargs.get("backend", "pygame") == "numba" and NumbaPlotRenderer is not None:
+            renderer_cls = NumbaPlotRenderer
+        renderer = renderer_cls(metrics.dim, metrics.axes_dim)
         self._ctx = DrawContext(theme=theme, metrics=metrics, renderer=renderer)
 
         # Build element registry
@@ -41,32 +57,76 @@ class Canvas:
         self.title = Title(kwargs.get("title", ""))
         self.axisx = Axis(Axis.X)
         self.axisy = Axis(Axis.Y)
-        self._elements = [self.axes, self.title, self.axisx, self.axisy]
+        self.legend = Legend(kwargs.get("legend", "upper right"))
+        self._elements = [self.axes, self.title, self.axisx, self.axisy, self.legend]
 
         self.domain_margin: float = 0.05
 
+        # Metric change coalescing. With auto_coalesce, changes are collected
+        # and elements are notified once at the next draw.
+        self.auto_coalesce: bool = kwargs.get("auto_coalesce", True)
+        self._pending_metrics: set[str | None] = set()
+        self._batch_depth = 0
+
         # Push current metrics to all elements so they compute their initial state.
         self._on_metrics_changed()
+        self.flush_metrics()
 
     def _on_metrics_changed(self, metric_name: str | None = None):
         """
         Called by Canvas property setters when any metric changes.
 
+        Records the changed metric. Elements are notified right away, unless
+        the change is made within batch_update or auto_coalesce is enabled.
+        """
+        self._pending_metrics.add(metric_name)
+        if self._batch_depth == 0 and not self.auto_coalesce:
+            self.flush_metrics()
+
+    def flush_metrics(self):
+        """
+        Notify elements of all metric changes since the last flush at once.
+
         Resizes renderer surfaces when layout-affecting metrics change, then
-        fans the notification out to every registered element.
+        fans the notification out to every registered element. Each element
+        is called once, with the set of all changed metric names.
         """
+        if not self._pending_metrics:
+            return
+        changed = self._pending_metrics
+        self._pending_metrics = set()
         metrics = self._ctx.metrics
         renderer = self._ctx.renderer
 
         # Only on dim/axes padding: resize the surfaces of plotrenderer
-        if metric_name in ('dim', None, 'xpad', 'ypad'):
+        if changed & {'dim', None, 'xpad', 'ypad'}:
             renderer.resize(metrics.dim, metrics.axes_dim)
 
         # For all changes: call metric change on elements
         for element in self._elements:
-            element.on_metrics_changed(metric_name, metrics)
+            element.on_metrics_changed(changed, metrics)
+
+    @contextmanager
+    def batch_update(self):
+        """
+        Context manager that coalesces all metric changes made within it,
+        so elements are notified once: when the outermost block exits, or at
+        the next draw if auto_coalesce is enabled:
+
+            with canvas.batch_update():
+                canvas.xdom = (0, 10)
+                canvas.ydom = (0, 5)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and not self.auto_coalesce:
+                self.flush_metrics()
             
     def draw(self, surface: pygame.Surface):
+        self.flush_metrics()
         ctx = self._ctx
         ctx.renderer.clear(ctx.theme)
 
@@ -82,11 +142,30 @@ class Canvas:
 
         ctx.renderer.draw(surface, ctx.metrics)
 
+    def close(self):
+        """
+        Release the renderer surfaces to the surface pool and close plots
+        that hold resources, such as the tile workers of TiledImagePlot.
+        """
+        for element in self._elements:
+            if hasattr(element, 'close'):
+                element.close()
+        self._ctx.renderer.release()
+
     def add_plot(self, plot: PlotType):
-        """Register a plot element and wire up its data-added callback."""
+        """Register a plot element and wire up its data-added and legend callbacks."""
         plot._on_data_added = self._check_domain_expansion
-        self._elements.append(plot)
-        plot.on_metrics_changed(None, self._ctx.metrics)
+        plot._on_legend_changed = self.legend.invalidate
+        self._elements.insert(self._elements.index(self.legend), plot)
+        self.legend.add_plot(plot)
+        plot.on_metrics_changed({None}, self._ctx.metrics)
+
+    def remove_plot(self, plot: PlotType):
+        """Unregister a plot element and its callbacks."""
+        plot._on_data_added = None
+        plot._on_legend_changed = None
+        self._elements.remove(plot)
+        self.legend.remove_plot(plot)
 
     def _check_domain_expansion(self, points: np.ndarray):
         """Expand xdom/ydom if new data falls outside the current domain.
@@ -95,30 +174,31 @@ class Canvas:
         added so the data doesn't sit right at the edge. Checking against the
         pre-margin bounds prevents the margin from compounding on every call.
         """
-        xdom = self._ctx.metrics.xdom
-        ydom = self._ctx.metrics.ydom
-        xmin, xmax = points[:,0].min(), points[:,0].max()
-        ymin, ymax = points[:,1].min(), points[:,1].max()
-
-        xmin_exceeded = xmin < xdom[0]
-        xmax_exceeded = xmax > xdom[1]
-        if xmin_exceeded or xmax_exceeded:
-            lo = min(xmin, xdom[0])
-            hi = max(xmax, xdom[1])
-            pad = self.domain_margin * (hi - lo)
-            self.xdom = (
-                lo - pad if xmin_exceeded else lo,
-                hi + pad if xmax_exceeded else hi)
-
-        ymin_exceeded = ymin < ydom[0]
-        ymax_exceeded = ymax > ydom[1]
-        if ymin_exceeded or ymax_exceeded:
-            lo = min(ymin, ydom[0])
-            hi = max(ymax, ydom[1])
-            pad = self.domain_margin * (hi - lo)
-            self.ydom = (
-                lo - pad if ymin_exceeded else lo,
-                hi + pad if ymax_exceeded else hi)
+        with self.batch_update():
+            xdom = self._ctx.metrics.xdom
+            ydom = self._ctx.metrics.ydom
+            xmin, xmax = points[:,0].min(), points[:,0].max()
+            ymin, ymax = points[:,1].min(), points[:,1].max()
+
+            xmin_exceeded = xmin < xdom[0]
+            xmax_exceeded = xmax > xdom[1]
+            if xmin_exceeded or xmax_exceeded:
+                lo = min(xmin, xdom[0])
+                hi = max(xmax, xdom[1])
+                pad = self.domain_margin * (hi - lo)
+                self.xdom = (
+                    lo - pad if xmin_exceeded else lo,
+                    hi + pad if xmax_exceeded else hi)
+
+            ymin_exceeded = ymin < ydom[0]
+            ymax_exceeded = ymax > ydom[1]
+            if ymin_exceeded or ymax_exceeded:
+                lo = min(ymin, ydom[0])
+                hi = max(ymax, ydom[1])
+                pad = self.domain_margin * (hi - lo)
+                self.ydom = (
+                    lo - pad if ymin_exceeded else lo,
+                    hi + pad if ymax_exceeded else hi)
 
     # ---- Settable metric properties
     @property
@@ -198,13 +278,13 @@ class Canvas:
 class Element(ABC):
 
     @abstractmethod
-    def on_metrics_changed(self, metric_name: str | None, metrics: PlotMetrics):
+    def on_metrics_changed(self, metric_names: set[str | None], metrics: PlotMetrics):
         """
-        Called by Canvas whenever a metric changes.
+        Called by Canvas whenever metrics change.
 
-        `metric_name` is the name of the changed metric (e.g. 'dim',
-        'xdom'), or None when all metrics should be considered changed
-        (e.g. on initial setup). `metrics` is the current `PlotMetrics`
+        `metric_names` is the set of names of the changed metrics (e.g.
+        {'dim', 'xdom'}). It contains None when all metrics should be
+        considered changed (e.g. on initial setup). `metrics` is the current `PlotMetrics`
         instance; elements must not store a permanent reference to it.
         """
         ...
@@ -220,12 +300,12 @@ class Axes(Element):
         self.dim = np.zeros(2)
         self.pos = np.zeros(2)
 
-    def on_metrics_changed(self, metric_name: str | None, metrics: PlotMetrics):
+    def on_metrics_changed(self, metric_names: set[str | None], metrics: PlotMetrics):
         # TODO: pos and dim should probably be private methods here to preserve a single source of truth
         # Or, even better, just fetch the dimensions directly from PlotMetrics at draw
-        if metric_name in ('pos', 'xpad', 'ypad', None):
+        if metric_names & {'pos', 'xpad', 'ypad', None}:
             self.pos = metrics.axes_pos
-        if metric_name in ('dim', 'xpad', 'ypad', None):
+        if metric_names & {'dim', 'xpad', 'ypad', None}:
             self.dim = metrics.axes_dim
 
     def draw(self, ctx: DrawContext):
@@ -236,6 +316,34 @@ class Axes(Element):
             on_axes=False)
 
 
+def nice_step(span: float, max_ticks: int) -> tuple[int, int]:
+    """
+    Return the smallest nice tick step (1, 2 or 5 times 10^k) that divides
+    span into at most max_ticks ticks, as a (mantissa, exponent) pair.
+    """
+    raw = span / max(1, max_ticks - 1)
+    exponent = floor(log10(raw))
+    for mantissa in (1, 2, 5):
+        if mantissa * 10.0 ** exponent >= raw:
+            return mantissa, exponent
+    return 1, exponent + 1
+
+
+@lru_cache(maxsize=1024)
+def format_tick(k: int, mantissa: int, exponent: int) -> str:
+    """
+    Format tick value k * mantissa * 10^exponent. Memoized on the quantized
+    step, so panning reuses the same strings for the ticks that stay visible.
+    """
+    value = k * mantissa * 10.0 ** exponent
+    if -5 < exponent < 5:
+        return f"%.{max(0, -exponent)}f" % value
+    if k == 0:
+        return "0"
+    precision = max(0, floor(log10(abs(k * mantissa))))
+    return np.format_float_scientific(value, precision=precision, trim='-', sign=False)
+
+
 class Axis(Element):
     
     # TODO: should this be an enum?
@@ -264,7 +372,12 @@ class Axis(Element):
         # Private attributes
         self._tick_num = kwargs.get("num_ticks", 6)
         self._tick_pos = np.zeros((0, 2))
+        self._tick_vals: npt.NDArray[np.float64] | None = None
         self._labels = []
+
+        # Nice-number ticks: tick k lies at value k * mantissa * 10^exponent
+        self._tick_step = (1, 0)
+        self._tick_k = np.zeros(0, dtype=int)
         
         # Tick mode: either fixed locations or fixed values
         self.tick_mode = None
@@ -272,13 +385,17 @@ class Axis(Element):
         # Label mode: either numberical or text
         self.label_mode = None
         
-    def on_metrics_changed(self, metric_name: str | None, metrics: PlotMetrics):
+    def on_metrics_changed(self, metric_names: set[str | None], metrics: PlotMetrics):
         """
         Recompute tick positions and labels whenever layout or domain changes.
         
         Some derived properties of metrics will be cached such that API-accessable 
         setters can work properly.
         """
+        dom_name = 'xdom' if self.orientation == Axis.X else 'ydom'
+        if not metric_names & {dom_name, 'dim', 'xpad', 'ypad', None}:
+            return
+
         # Calculate/cache plot metrics
         self._dom = metrics.xdom if self.orientation == Axis.X else metrics.ydom
         self._span = metrics.xdom_span if self.orientation == Axis.X else metrics.ydom_span
@@ -335,10 +452,18 @@ class Axis(Element):
         return self._tick_pos
     
     @tick_pos.setter
-    def tick_pos(self, val: npt.NDArray[np.float64]):
-        """Set custom ticks fixed positions."""
+    def tick_pos(self, val: npt.ArrayLike | None):
+        """
+        Place ticks at fixed values in data coordinates, so ticks move along
+        with the data when the domain changes. When val is None, the values
+        are nice numbers (1, 2 or 5 times 10^k), with at most tick_num ticks.
+        """
         self.tick_mode = Axis.FIXED_TICK_VALUES
-        raise NotImplementedError
+        self.label_mode = Axis.LABELS_NUMERICAL
+        self._tick_vals = None if val is None else np.asarray(val, dtype=float)
+
+        self._compute_fixed_tick_val_coordinates()
+        self._update_numerical_labels()
     
     @property
     def labels(self):
@@ -381,17 +506,46 @@ class Axis(Element):
             endpoint=True)
         
     def _compute_fixed_tick_val_coordinates(self):
-         """Calculate the coordinates of ticks based on their values."""
-         raise NotImplementedError   
+        """Calculate the coordinates of ticks based on their values."""
+        if self._span <= 0:
+            self._tick_k = np.zeros(0, dtype=int)
+            self._tick_pos = np.zeros((0, 2))
+            return
+
+        if self._tick_vals is None:
+            mantissa, exponent = nice_step(self._span, self._tick_num)
+            step = mantissa * 10.0 ** exponent
+            self._tick_step = (mantissa, exponent)
+            self._tick_k = np.arange(
+                ceil(self._dom[0] / step), floor(self._dom[1] / step) + 1)
+            values = self._tick_k * step
+        else:
+            values = self._tick_vals[
+                (self._tick_vals >= self._dom[0]) & (self._tick_vals <= self._dom[1])]
+
+        fractions = (values - self._dom[0]) / self._span
+        self._tick_pos = (
+            self._axis_line_endpoints[0]
+            + np.outer(fractions, self.axis_direction * self._axes_dim))
 
     def _update_numerical_labels(self):
         """Format tick labels based on the current domain magnitude."""
-        numbers = np.linspace(
-            self._dom[0] + self._span * self.tick_margin,
-            self._dom[1] - self._span * self.tick_margin,
-            num=self._tick_num,
-            endpoint=True)
-
+        if self.tick_mode == Axis.FIXED_TICK_VALUES:
+            if self._tick_vals is None:
+                self._labels = [format_tick(k, *self._tick_step) for k in self._tick_k.tolist()]
+                return
+            numbers = self._tick_vals[
+                (self._tick_vals >= self._dom[0]) & (self._tick_vals <= self._dom[1])]
+        else:
+            numbers = np.linspace(
+                self._dom[0] + self._span * self.tick_margin,
+                self._dom[1] - self._span * self.tick_margin,
+                num=self._tick_num,
+                endpoint=True)
+
+        if not np.any(numbers):
+            self._labels = ["0"] * len(numbers)
+            return
         order_of_magnitude = floor(log10(max(abs(numbers))))
 
         if -4 < order_of_magnitude < 5:
@@ -410,7 +564,9 @@ class Title(Element):
         self.title = title
         self.pos = np.zeros(2)
 
-    def on_metrics_changed(self, metric_name: str | None, metrics: PlotMetrics):
+    def on_metrics_changed(self, metric_names: set[str | None], metrics: PlotMetrics):
+        if not metric_names & {'dim', 'xpad', 'ypad', None}:
+            return
         self.pos = np.array([
             metrics.axes_xpad[0] + metrics.axes_dim[0] / 2,
             metrics.axes_ypad[0] / 2])
@@ -424,12 +580,96 @@ class Title(Element):
 
 class Legend(Element):
 
-    def __init__(self):
-        """Legend element for plots (stub)."""
-        pass
+    LOCATIONS = ('upper right', 'upper left', 'lower right', 'lower left')
+
+    def __init__(self, location: str = 'upper right', **kwargs):
+        """
+        Legend with a handle and label for each plot, inside the axes.
 
-    def on_metrics_changed(self, metric_name: str | None, metrics: PlotMetrics):
-        pass
+        The box, handles and labels are rendered once into a cached surface
+        that is blitted each frame. The cache is only rebuilt when plots are
+        added or removed, or when a plot label, color or enabled flag
+        changes. Layout changes only move the cached surface. Disabled plots
+        are listed with a greyed-out handle and label.
+        """
+        assert location in Legend.LOCATIONS, f"Location must be one of {Legend.LOCATIONS}"
+        self.location = location
+        self.visible: bool = kwargs.get("visible", True)
+        self.margin = kwargs.get("margin", 4)
+        self.padding = kwargs.get("padding", 4)
+        self.line_spacing = kwargs.get("line_spacing", 2)
+        self.handle_dim = kwargs.get("handle_dim", (8, 3))
+        self.plots: list[PlotType] = []
+        self.pos = np.zeros(2)
+
+        # Cached derived properties from PlotMetrics
+        self._axes_dim = np.zeros(2)
+
+        # Cached legend surface, None when it has to be rebuilt
+        self._surface: pygame.Surface | None = None
+
+    def add_plot(self, plot: PlotType):
+        self.plots.append(plot)
+        self.invalidate()
+
+    def remove_plot(self, plot: PlotType):
+        self.plots.remove(plot)
+        self.invalidate()
+
+    def invalidate(self):
+        """Rebuild the legend surface at the next draw."""
+        self._surface = None
+
+    def on_metrics_changed(self, metric_names: set[str | None], metrics: PlotMetrics):
+        if not metric_names & {'dim', 'xpad', 'ypad', None}:
+            return
+        self._axes_dim = metrics.axes_dim
+        if self._surface is not None:
+            self._update_pos()
 
     def draw(self, ctx: DrawContext):
-        pass
+        if not self.visible or not self.plots:
+            return
+        if self._surface is None:
+            self._surface = self._build_surface(ctx.theme)
+            self._update_pos()
+        ctx.renderer.blit(self._surface, self.pos)
+
+    def _update_pos(self):
+        """Position the legend surface in a corner of the axes surface."""
+        width, height = self._surface.get_size()
+        left, top = self.margin, self.margin
+        right, bottom = self._axes_dim - self.margin
+        self.pos = np.array([
+            left if self.location.endswith('left') else right - width,
+            top if self.location.startswith('upper') else bottom - height])
+
+    def _build_surface(self, theme: PlotTheme) -> pygame.Surface:
+        """Render the box, handles and labels of all plots to one surface."""
+        font, font_color = theme.fonts["legend"]
+        disabled_color = theme.colors["axes_line"]
+        handle_w, handle_h = self.handle_dim
+        line_height = font.get_linesize()
+
+        text_blocks = [
+            font.render(plot.label, True, font_color if plot.enabled else disabled_color)
+            for plot in self.plots]
+        text_width = max(block.get_width() for block in text_blocks)
+
+        width = 2 * self.padding + handle_w + self.padding + text_width
+        height = (
+            2 * self.padding + len(self.plots) * line_height
+            + (len(self.plots) - 1) * self.line_spacing)
+        surface = pygame.Surface((width, height))
+        surface.fill(theme.colors["axes_bg"])
+        pygame.draw.rect(surface, theme.colors["axes_line"], surface.get_rect(), 1)
+
+        y = self.padding
+        for plot, text_block in zip(self.plots, text_blocks):
+            handle_color = plot.color[:3] if plot.enabled else disabled_color
+            handle = pygame.Rect(
+                self.padding, y + (line_height - handle_h) // 2, handle_w, handle_h)
+            surface.fill(handle_color, handle)
+            surface.blit(text_block, (2 * self.padding + handle_w, y))
+            y += line_height + self.line_spacing
+        return surface
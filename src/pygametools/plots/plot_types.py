@@ -1,9 +1,16 @@
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from math import ceil, floor, log2
+from threading import Lock
 from typing import Callable
 import numpy as np
+import numpy.typing as npt
+import pygame
 
-from pygametools.plots.types import XYPlotData
+from pygametools.plots.types import XYPlotData, XYDataSourceLike
 from .drawing import DrawContext, PlotMetrics
+from .sources import XYDataSource
 
 
 class PlotType(ABC):
@@ -19,21 +26,53 @@ class PlotType(ABC):
     - Expose name and color for the Legend.
     - Fire _on_data_added (set by Canvas.add_plot) when new data is added,
       so Canvas can check whether the domain needs expanding.
+    - Fire _on_legend_changed (set by Canvas.add_plot) when the label, color
+      or enabled flag changes, so the Legend only re-renders on changes.
     """
 
     def __init__(self, color: tuple, label: str):
+        self._on_data_added: Callable | None = None
+        self._on_legend_changed: Callable | None = None
         self.color = color
         self.label = label
-        self._on_data_added: Callable | None = None
-        
+
         # Disables drawing and _on_data_added callback
         self.enabled: bool = True
 
+    def _set_legend_attr(self, name: str, val):
+        setattr(self, name, val)
+        if self._on_legend_changed:
+            self._on_legend_changed()
+
+    @property
+    def color(self) -> tuple:
+        return self._color
+
+    @color.setter
+    def color(self, val: tuple):
+        self._set_legend_attr('_color', val)
+
+    @property
+    def label(self) -> str:
+        return self._label
+
+    @label.setter
+    def label(self, val: str):
+        self._set_legend_attr('_label', val)
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, val: bool):
+        self._set_legend_attr('_enabled', val)
+
     @abstractmethod
     def draw(self, ctx: DrawContext): ...
 
     @abstractmethod
-    def on_metrics_changed(self, metric_name: str | None, metrics: PlotMetrics): ...
+    def on_metrics_changed(self, metric_names: set[str | None], metrics: PlotMetrics): ...
 
 
 class ScatterPlot(PlotType):
@@ -44,6 +83,22 @@ class ScatterPlot(PlotType):
         self.alpha = alpha
         self.data = np.empty((0,2))
 
+        # Optional zero-copy data source, read only within the domain.
+        # _visible is None when it has to be re-read at the next draw.
+        self.source: XYDataSource | None = None
+        self._visible: np.ndarray | None = None
+
+    def set_source(self, source: XYDataSourceLike | XYDataSource, **kwargs):
+        """
+        Plot a (possibly larger than RAM) data source instead of self.data.
+        Kwargs are passed to XYDataSource. Only the points within the domain
+        are read, when the domain changes.
+        """
+        if not isinstance(source, XYDataSource):
+            source = XYDataSource(source, **kwargs)
+        self.source = source
+        self._visible = None
+
     def add_data(self, points: XYPlotData, check_domain: bool | None = None):
         """Add data. Check_domain overrides self.enabled for domain checks."""
         points = np.reshape(points, (-1, 2))
@@ -56,14 +111,21 @@ class ScatterPlot(PlotType):
             self._on_data_added(points)
 
     def draw(self, ctx: DrawContext):
-        if not self.enabled or self.data.shape[0] == 0:
+        if not self.enabled:
+            return
+        data = self.data
+        if self.source is not None:
+            if self._visible is None:
+                self._visible = self.source.visible(
+                    ctx.metrics.xdom, ctx.metrics.ydom, width=ctx.metrics.axes_dim[0])
+            data = self._visible
+        if data.shape[0] == 0:
             return
-    
-        for xy in self.data:
-            ctx.renderer.point(xy, self.color, ctx.metrics, self.radius, self.alpha)
+        ctx.renderer.points(data, self.color, ctx.metrics, self.radius, self.alpha)
 
-    def on_metrics_changed(self, metric_name: str | None, metrics: PlotMetrics):
-        pass
+    def on_metrics_changed(self, metric_names: set[str | None], metrics: PlotMetrics):
+        if metric_names & {'xdom', 'ydom', 'dim', 'xpad', None}:
+            self._visible = None
 
 
 class LinePlot(PlotType):
@@ -72,6 +134,22 @@ class LinePlot(PlotType):
         super().__init__(color, label)
         self.data = np.empty((0, 2))
 
+        # Optional zero-copy data source, read only within the domain.
+        # _visible is None when it has to be re-read at the next draw.
+        self.source: XYDataSource | None = None
+        self._visible: np.ndarray | None = None
+
+    def set_source(self, source: XYDataSourceLike | XYDataSource, **kwargs):
+        """
+        Plot a (possibly larger than RAM) data source instead of self.data.
+        Kwargs are passed to XYDataSource. Only the points within the x
+        domain (plus one on either side) are read, when the domain changes.
+        """
+        if not isinstance(source, XYDataSource):
+            source = XYDataSource(source, **kwargs)
+        self.source = source
+        self._visible = None
+
     def add_data(self, points: XYPlotData, check_domain: bool | None = None):
         points = np.reshape(points, (-1, 2))
         self.data = np.vstack([self.data, points])
@@ -82,10 +160,237 @@ class LinePlot(PlotType):
             self._on_data_added(points)
 
     def draw(self, ctx: DrawContext):
-        if not self.enabled or self.data.shape[0] < 2:
+        if not self.enabled:
+            return
+        data = self.data
+        if self.source is not None:
+            if self._visible is None:
+                self._visible = self.source.visible(
+                    ctx.metrics.xdom, pad=1, width=ctx.metrics.axes_dim[0], extrema=True)
+            data = self._visible
+        if data.shape[0] < 2:
             return
-        ctx.renderer.polyline(self.data, self.color, ctx.metrics)
+        ctx.renderer.polyline(data, self.color, ctx.metrics)
 
-    def on_metrics_changed(self, metric_name: str | None, metrics: PlotMetrics):
-        pass
+    def on_metrics_changed(self, metric_names: set[str | None], metrics: PlotMetrics):
+        if metric_names & {'xdom', 'dim', 'xpad', None}:
+            self._visible = None
+
+
+class TiledImagePlot(PlotType):
+
+    TILE_SIZE = 256
+
+    def __init__(
+            self,
+            arr: npt.ArrayLike,
+            label: str,
+            extent: tuple[float, float, float, float] | None = None,
+            color_hi: tuple = (255, 255, 255),
+            color_lo: tuple = (0, 0, 0),
+            value_range: tuple[float, float] = (0, 1),
+            cache_size: int = 256,
+            workers: int = 0):
+        """
+        Image plot for very large arrays, drawn from a tiled mipmap pyramid.
+
+        The pyramid consists of uint8 tiles of TILE_SIZE pixels. Level 0
+        tiles are converted from slices of arr. A level L tile is built
+        directly from arr, as the 2x2 block mean of every 2**(L-1)-th row and
+        column, so building a tile never needs the levels below it and costs
+        the same at every level. Tiles are built lazily when they first
+        become visible. Each frame only the tiles that intersect the current
+        domain are drawn, at the level that matches the on-screen scale.
+        Tiles and scaled tile surfaces are kept in LRU caches. Call close()
+        to stop the worker threads when the plot is no longer used.
+
+        Args:
+            arr: Scalar (rows, cols) array or RGB (rows, cols, 3) array. Row 0
+                is drawn at the top. Only the slices needed for level 0 tiles
+                are read, so arr can be a np.memmap.
+            extent: (xmin, xmax, ymin, ymax) covered by the image in graph
+                coordinates. Defaults to the array dimensions in pixels.
+            color_hi: Color of scalar values at value_range[1].
+            color_lo: Color of scalar values at value_range[0].
+            value_range: Scalar values are clipped to this range. RGB arrays
+                are used as-is when uint8, or clipped to (0, 1) otherwise.
+            cache_size: Maximum number of tiles, and of scaled tile surfaces,
+                kept.
+            workers: If > 0, tiles are built on a thread pool with this many
+                workers, and tiles that are not ready yet are skipped.
+        """
+        super().__init__(color_hi, label)
+        self.arr = arr
+        rows, cols = np.shape(arr)[:2]
+        self.extent = extent if extent is not None else (0, cols, 0, rows)
+        self.value_range = value_range
+        self.cache_size = cache_size
+
+        # Scalar tiles are colored through a lookup table when drawn
+        self._is_rgb = np.ndim(arr) == 3
+        self._lut = np.linspace(color_lo, color_hi, num=256).astype(np.uint8)
+
+        # Pyramid levels; the top level fits in a single tile
+        self._shapes = [(rows, cols)]
+        while max(self._shapes[-1]) > self.TILE_SIZE:
+            r, c = self._shapes[-1]
+            self._shapes.append((ceil(r / 2), ceil(c / 2)))
 
+        # LRU caches of tile arrays by (level, i, j) and of scaled surfaces
+        self._tiles: OrderedDict[tuple, np.ndarray] = OrderedDict()
+        self._surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self._lock = Lock()
+        self._pending: dict[tuple, Future] = {}
+        self._executor = ThreadPoolExecutor(workers) if workers > 0 else None
+
+    def close(self):
+        """Stop the tile worker threads and drop the caches."""
+        executor = getattr(self, '_executor', None)
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._pending.clear()
+        if hasattr(self, '_tiles'):
+            self._tiles.clear()
+            self._surfaces.clear()
+
+    def __del__(self):
+        self.close()
+
+    def _to_uint8(self, block: np.ndarray) -> np.ndarray:
+        """Convert a block of the source array to uint8 tile pixels."""
+        if self._is_rgb and block.dtype == np.uint8:
+            return block.copy()
+        if self._is_rgb:
+            return (np.clip(block, 0, 1) * 255).astype(np.uint8)
+        lo, hi = self.value_range
+        return (np.clip((block - lo) / (hi - lo), 0, 1) * 255).astype(np.uint8)
+
+    def _build_tile(self, level: int, i: int, j: int) -> np.ndarray:
+        """Return a tile array, building it from the source array if needed."""
+        key = (level, i, j)
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                return tile
+
+        # Source rows/columns covered by the tile
+        t = self.TILE_SIZE
+        span = t * 2 ** level
+        rows, cols = self._shapes[0]
+        r0, r1 = i * span, min(rows, (i+1) * span)
+        c0, c1 = j * span, min(cols, (j+1) * span)
+
+        if level == 0:
+            tile = self._to_uint8(np.asarray(self.arr[r0:r1, c0:c1]))
+        else:
+            # 2x2 block mean of every step-th source pixel, padded to even size
+            step = 2 ** (level - 1)
+            sampled = self._to_uint8(np.asarray(self.arr[r0:r1:step, c0:c1:step]))
+            pad = [(0, sampled.shape[0] % 2), (0, sampled.shape[1] % 2)]
+            sampled = np.pad(sampled, pad + [(0, 0)] * (sampled.ndim - 2), mode='edge')
+            tile = (
+                sampled[0::2, 0::2].astype(np.uint16) + sampled[1::2, 0::2]
+                + sampled[0::2, 1::2] + sampled[1::2, 1::2] + 2) // 4
+            tile = tile.astype(np.uint8)
+
+        with self._lock:
+            self._tiles[key] = tile
+            if len(self._tiles) > self.cache_size:
+                self._tiles.popitem(last=False)
+        return tile
+
+    def _get_tile(self, level: int, i: int, j: int) -> np.ndarray | None:
+        """Return a tile array, or None if it is still being built."""
+        key = (level, i, j)
+        if self._executor is None:
+            return self._build_tile(*key)
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                return tile
+
+        future = self._pending.get(key)
+        if future is None:
+            self._pending[key] = self._executor.submit(self._build_tile, *key)
+        elif future.done():
+            del self._pending[key]
+            return future.result()
+        return None
+
+    def _get_surface(self, key: tuple, tile: np.ndarray, crop: tuple, size: tuple):
+        """Return the cropped and scaled tile surface from the LRU cache."""
+        cache_key = (*key, *crop, *size)
+        surface = self._surfaces.get(cache_key)
+        if surface is not None:
+            self._surfaces.move_to_end(cache_key)
+            return surface
+
+        r0, c0, r1, c1 = crop
+        pixels = tile[r0:r1, c0:c1]
+        rgb = pixels if self._is_rgb else self._lut[pixels]
+        surface = pygame.surfarray.make_surface(rgb.swapaxes(0, 1))
+        surface = pygame.transform.scale(surface, size)
+
+        self._surfaces[cache_key] = surface
+        if len(self._surfaces) > self.cache_size:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def draw(self, ctx: DrawContext):
+        if not self.enabled:
+            return
+        metrics = ctx.metrics
+        xmin, xmax, ymin, ymax = self.extent
+        axes_w, axes_h = metrics.axes_dim
+
+        # Axes pixels per graph unit
+        px_x = axes_w / metrics.xdom_span
+        px_y = axes_h / metrics.ydom_span
+
+        # Pick the level where one tile pixel is about one screen pixel
+        rows, cols = self._shapes[0]
+        scale = max(cols / (xmax - xmin) / px_x, rows / (ymax - ymin) / px_y)
+        level = min(max(0, floor(log2(scale))) if scale > 1 else 0, len(self._shapes) - 1)
+
+        # Graph units per level pixel, and the visible level pixel range
+        unit_x = (xmax - xmin) / cols * 2 ** level
+        unit_y = (ymax - ymin) / rows * 2 ** level
+        level_rows, level_cols = self._shapes[level]
+        c_lo = max(0, floor((metrics.xdom[0] - xmin) / unit_x))
+        c_hi = min(level_cols, ceil((metrics.xdom[1] - xmin) / unit_x))
+        r_lo = max(0, floor((ymax - metrics.ydom[1]) / unit_y))
+        r_hi = min(level_rows, ceil((ymax - metrics.ydom[0]) / unit_y))
+        if c_lo >= c_hi or r_lo >= r_hi:
+            return
+
+        # Axes pixel position of level pixel column c / row r
+        def axes_x(c):
+            return (xmin + c * unit_x - metrics.xdom[0]) * px_x
+
+        def axes_y(r):
+            return (metrics.ydom[1] - (ymax - r * unit_y)) * px_y
+
+        t = self.TILE_SIZE
+        for i in range(r_lo // t, (r_hi - 1) // t + 1):
+            for j in range(c_lo // t, (c_hi - 1) // t + 1):
+                tile = self._get_tile(level, i, j)
+                if tile is None:
+                    continue
+
+                # Crop to the visible part of the tile, in level pixels
+                r0, r1 = max(r_lo, i*t), min(r_hi, i*t + tile.shape[0])
+                c0, c1 = max(c_lo, j*t), min(c_hi, j*t + tile.shape[1])
+                x0, x1 = round(axes_x(c0)), round(axes_x(c1))
+                y0, y1 = round(axes_y(r0)), round(axes_y(r1))
+                if x1 <= x0 or y1 <= y0:
+                    continue
+
+                crop = (r0 - i*t, c0 - j*t, r1 - i*t, c1 - j*t)
+                surface = self._get_surface((level, i, j), tile, crop, (x1 - x0, y1 - y0))
+                ctx.renderer.blit(surface, (x0, y0))
+
+    def on_metrics_changed(self, metric_names: set[str | None], metrics: PlotMetrics):
+        pass
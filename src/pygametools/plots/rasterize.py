@@ -0,0 +1,301 @@
+import numpy as np
+import numpy.typing as npt
+import pygame
+from numba import njit, prange
+from .drawing import PlotRenderer, PlotTheme, PlotMetrics
+from .types import MetricCoordinates
+
+# Width in pixels of the column tiles that are rasterized in parallel. Each
+# tile is owned by one thread, so blending never races between threads.
+TILE_WIDTH = 16
+
+
+@njit(inline='always')
+def _blend(buf, x, y, col, alpha):
+    """Blend col onto a single buffer pixel with src-over compositing."""
+    for c in range(3):
+        dst = float(buf[x, y, c])
+        buf[x, y, c] = np.uint8(dst + (col[c] - dst) * alpha + 0.5)
+
+
+@njit(parallel=True)
+def raster_discs(buf, pixels, radius, col, alpha):
+    """
+    Rasterize a filled disc for each (x, y) pixel coordinate into an
+    (W, H, 3) uint8 buffer. Points are processed in order within each tile,
+    so overlapping semi-transparent discs accumulate like sequential draws.
+    """
+    width, height = buf.shape[0], buf.shape[1]
+    num_tiles = (width + TILE_WIDTH - 1) // TILE_WIDTH
+    r2 = radius * radius
+
+    for t in prange(num_tiles):
+        x_lo = t * TILE_WIDTH
+        x_hi = min(width, x_lo + TILE_WIDTH)
+        for i in range(pixels.shape[0]):
+            cx, cy = pixels[i, 0], pixels[i, 1]
+            if cx + radius < x_lo or cx - radius >= x_hi:
+                continue
+            for x in range(max(x_lo, cx - radius), min(x_hi, cx + radius + 1)):
+                dx = x - cx
+                for y in range(max(0, cy - radius), min(height, cy + radius + 1)):
+                    dy = y - cy
+                    if dx * dx + dy * dy <= r2:
+                        _blend(buf, x, y, col, alpha)
+
+
+@njit(parallel=True)
+def raster_rects(buf, rects, col, alpha):
+    """
+    Rasterize filled (left, top, width, height) rects into an (W, H, 3)
+    uint8 buffer, using the same column tiling as raster_discs.
+    """
+    width, height = buf.shape[0], buf.shape[1]
+    num_tiles = (width + TILE_WIDTH - 1) // TILE_WIDTH
+
+    for t in prange(num_tiles):
+        x_lo = t * TILE_WIDTH
+        x_hi = min(width, x_lo + TILE_WIDTH)
+        for i in range(rects.shape[0]):
+            left, top, w, h = rects[i, 0], rects[i, 1], rects[i, 2], rects[i, 3]
+            for x in range(max(x_lo, left), min(x_hi, left + w)):
+                for y in range(max(0, top), min(height, top + h)):
+                    _blend(buf, x, y, col, alpha)
+
+
+@njit(inline='always')
+def _clip_segment(x0, y0, x1, y1, lo, x_hi, y_hi):
+    """
+    Clip the segment (x0, y0)-(x1, y1) to [lo, x_hi] x [lo, y_hi] with the
+    Liang-Barsky algorithm. Returns whether any part of the segment is
+    inside, and the clipped end points.
+    """
+    dx = x1 - x0
+    dy = y1 - y0
+    t0, t1 = 0.0, 1.0
+    ps = (-dx, dx, -dy, dy)
+    qs = (x0 - lo, x_hi - x0, y0 - lo, y_hi - y0)
+    for k in range(4):
+        p, q = ps[k], qs[k]
+        if p == 0:
+            if q < 0:
+                return False, x0, y0, x1, y1
+        elif p < 0:
+            t0 = max(t0, q / p)
+        else:
+            t1 = min(t1, q / p)
+    if t0 > t1:
+        return False, x0, y0, x1, y1
+    return True, x0 + t0 * dx, y0 + t0 * dy, x0 + t1 * dx, y0 + t1 * dy
+
+
+@njit
+def raster_segments(buf, segments, col, aa):
+    """
+    Rasterize unconnected (N, 2, 2) line segments in float pixel coordinates
+    into an (W, H, 3) uint8 buffer, in order, like sequential line draws.
+    Each segment is sampled once per pixel along its major axis. With aa,
+    the two pixels straddling each sample are blended with their coverage
+    (Xiaolin Wu's algorithm, without end point weighting); otherwise the
+    nearest pixel is set. Segments are clipped to the buffer first, and
+    segments with a non-finite end point are skipped.
+    """
+    width, height = buf.shape[0], buf.shape[1]
+
+    for i in range(segments.shape[0]):
+        fx0, fy0 = segments[i, 0, 0], segments[i, 0, 1]
+        fx1, fy1 = segments[i, 1, 0], segments[i, 1, 1]
+        if not (np.isfinite(fx0) and np.isfinite(fy0) and np.isfinite(fx1) and np.isfinite(fy1)):
+            continue
+        visible, fx0, fy0, fx1, fy1 = _clip_segment(
+            fx0, fy0, fx1, fy1, -1.0, float(width), float(height))
+        if not visible:
+            continue
+
+        # Walk the major axis from low to high; steep segments swap x and y
+        steep = abs(fy1 - fy0) > abs(fx1 - fx0)
+        if steep:
+            fx0, fy0, fx1, fy1 = fy0, fx0, fy1, fx1
+        if fx0 > fx1:
+            fx0, fy0, fx1, fy1 = fx1, fy1, fx0, fy0
+        gradient = (fy1 - fy0) / (fx1 - fx0) if fx1 > fx0 else 0.0
+
+        for u in range(int(np.floor(fx0 + 0.5)), int(np.floor(fx1 + 0.5)) + 1):
+            v = fy0 + (u - fx0) * gradient
+            if aa:
+                v0 = int(np.floor(v))
+                frac = v - v0
+                for dv, alpha in ((0, 1.0 - frac), (1, frac)):
+                    x, y = (v0 + dv, u) if steep else (u, v0 + dv)
+                    if alpha > 0 and 0 <= x < width and 0 <= y < height:
+                        _blend(buf, x, y, col, alpha)
+            else:
+                v0 = int(np.floor(v + 0.5))
+                x, y = (v0, u) if steep else (u, v0)
+                if 0 <= x < width and 0 <= y < height:
+                    for c in range(3):
+                        buf[x, y, c] = col[c]
+
+
+@njit(parallel=True)
+def raster_polyline(buf, pixels, col):
+    """
+    Rasterize an opaque polyline through (x, y) float pixel coordinates into
+    an (W, H, 3) uint8 buffer with Bresenham's algorithm, between the pixels
+    nearest to the end points. Each segment is
+    first clipped to the buffer, so far off-screen points cost no more than
+    points on the edge; segments with a non-finite end point are skipped.
+    Segments run in parallel; concurrent writes to a shared pixel all write
+    the same color.
+    """
+    width, height = buf.shape[0], buf.shape[1]
+
+    for i in prange(pixels.shape[0] - 1):
+        fx0, fy0 = pixels[i, 0], pixels[i, 1]
+        fx1, fy1 = pixels[i + 1, 0], pixels[i + 1, 1]
+        if not (np.isfinite(fx0) and np.isfinite(fy0) and np.isfinite(fx1) and np.isfinite(fy1)):
+            continue
+
+        # Clip to the coordinates that round into the buffer
+        visible, fx0, fy0, fx1, fy1 = _clip_segment(
+            fx0, fy0, fx1, fy1, -0.5, width - 0.5, height - 0.5)
+        if not visible:
+            continue
+        x, y = int(fx0 + 0.5), int(fy0 + 0.5)
+        x1, y1 = int(fx1 + 0.5), int(fy1 + 0.5)
+
+        dx = abs(x1 - x)
+        dy = -abs(y1 - y)
+        sx = 1 if x < x1 else -1
+        sy = 1 if y < y1 else -1
+        err = dx + dy
+        while True:
+            if 0 <= x < width and 0 <= y < height:
+                for c in range(3):
+                    buf[x, y, c] = col[c]
+            if x == x1 and y == y1:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x += sx
+            if e2 <= dx:
+                err += dx
+                y += sy
+
+
+class NumbaPlotRenderer(PlotRenderer):
+
+    def __init__(self, dim: npt.ArrayLike, axes_dim: npt.ArrayLike):
+        """
+        PlotRenderer backend that rasterizes points, polylines and rects on
+        the axes with numba kernels into a (W, H, 3) uint8 buffer.
+
+        The buffer is copied to the axes surface once per frame. Primitives
+        without a kernel (text, vectors, etc.) are drawn with pygame; the
+        buffer and surface are synced whenever drawing switches between the
+        two, so draw order is preserved. The axes surface is opaque after
+        clear, so the buffer does not need an alpha channel. Unlike the
+        pygame backend, kernel primitives are not anti-aliased.
+        """
+        super().__init__(dim, axes_dim)
+        self._buffer = np.zeros((*self.surface_axes.get_size(), 3), np.uint8)
+        self._buffer_current = False
+
+    def resize(self, dim: npt.ArrayLike, axes_dim: npt.ArrayLike):
+        super().resize(dim, axes_dim)
+        self._buffer = np.zeros((*self.surface_axes.get_size(), 3), np.uint8)
+        self._buffer_current = False
+
+    def clear(self, theme: PlotTheme):
+        super().clear(theme)
+        self._buffer[:] = theme.colors["axes_bg"][:3]
+        self._buffer_current = True
+
+    def _use_buffer(self):
+        """Make the buffer hold the current axes pixels before a kernel draw."""
+        if not self._buffer_current:
+            np.copyto(self._buffer, pygame.surfarray.pixels3d(self.surface_axes))
+            self._buffer_current = True
+
+    def _use_surface(self):
+        """Copy the buffer to the axes surface before a pygame draw."""
+        if self._buffer_current:
+            pygame.surfarray.pixels3d(self.surface_axes)[:] = self._buffer
+            self._buffer_current = False
+
+    def draw(self, surface: pygame.Surface, metrics: PlotMetrics):
+        self._use_surface()
+        super().draw(surface, metrics)
+
+    def get_surface_pos(
+            self,
+            pos: MetricCoordinates,
+            on_axes: bool,
+            metrics: PlotMetrics) -> tuple[pygame.Surface, npt.NDArray]:
+        if on_axes:
+            self._use_surface()
+        return super().get_surface_pos(pos, on_axes, metrics)
+
+    def blit(
+            self,
+            surface: pygame.Surface,
+            pos: MetricCoordinates,
+            on_axes: bool = True):
+        if on_axes:
+            self._use_surface()
+        super().blit(surface, pos, on_axes)
+
+    def point(
+            self,
+            pos: MetricCoordinates,
+            col: tuple,
+            metrics: PlotMetrics,
+            radius: int,
+            alpha: float = 1,
+            on_axes: bool = True):
+        if not on_axes:
+            super().point(pos, col, metrics, radius, alpha, on_axes)
+            return
+        self.points(np.reshape(pos, (1, 2)), col, metrics, radius, alpha)
+
+    def points(
+            self,
+            points: npt.ArrayLike,
+            col: tuple,
+            metrics: PlotMetrics,
+            radius: int,
+            alpha: float = 1):
+        self._use_buffer()
+        pixels = self.axes_coords(np.reshape(points, (-1, 2)), metrics)
+        raster_discs(
+            self._buffer, pixels, int(radius),
+            np.asarray(col[:3], dtype=np.float64), float(alpha))
+
+    def polyline(
+            self,
+            points: npt.ArrayLike,
+            col: tuple,
+            metrics: PlotMetrics):
+        pts = np.asarray(points, dtype=float)
+        pts = pts[np.isfinite(pts).all(axis=1)]
+        if len(pts) < 2:
+            return
+        self._use_buffer()
+        raster_polyline(
+            self._buffer, self.axes_coords_float(pts, metrics) - 0.5,
+            np.asarray(col[:3], dtype=np.uint8))
+
+    def rects(
+            self,
+            pos: npt.ArrayLike,
+            dim: npt.ArrayLike,
+            facecol: tuple,
+            metrics: PlotMetrics):
+        self._use_buffer()
+        pixels = self.axes_coords(np.reshape(pos, (-1, 2)), metrics)
+        rects = np.hstack([pixels, np.reshape(dim, (-1, 2)).astype(int)])
+        alpha = facecol[3] / 255 if len(facecol) > 3 else 1.0
+        raster_rects(
+            self._buffer, rects,
+            np.asarray(facecol[:3], dtype=np.float64), float(alpha))
@@ -0,0 +1,180 @@
+import os
+import numpy as np
+import numpy.typing as npt
+from pygametools.loaders import load_delimited
+from .types import Domain, XYDataSourceLike
+
+
+class XYDataSource:
+
+    CHUNK_SIZE = 1_000_000
+
+    # Default limit on the rows returned by visible(): per pixel of the axes
+    # width when it is given, and in total otherwise
+    POINTS_PER_PIXEL = 4
+    MAX_POINTS = 100_000
+
+    def __init__(
+            self,
+            source: XYDataSourceLike,
+            x_sorted: bool | None = None,
+            max_points: int | None = None):
+        """
+        Zero-copy (N, 2) data source for plots.
+
+        The source is only read on demand: visible() reads the rows that fall
+        within a domain, so sources larger than RAM can be plotted. When the
+        x column is sorted (e.g. time series), the visible rows are found with
+        a binary search that only reads about log2(N) rows. Otherwise the
+        source is scanned in chunks of CHUNK_SIZE rows. Visible rows are
+        always decimated to a bounded number, so a zoomed out view of a huge
+        source never copies it into memory.
+
+        Args:
+            source: A .npy path (memory-mapped read-only), a delimited text
+                path (parsed once and cached by load_delimited), np.memmap,
+                or any array or buffer-protocol object that can be viewed as
+                an (N, 2) array without copying.
+            x_sorted: Whether x is non-decreasing. Detected with a chunked
+                scan when None.
+            max_points: Maximum number of rows returned by visible(). When
+                None, POINTS_PER_PIXEL times the axes width passed to
+                visible(), or MAX_POINTS without a width.
+        """
+        if isinstance(source, (str, os.PathLike)) and os.fspath(source).endswith('.npy'):
+            data = np.load(source, mmap_mode='r')
+        elif isinstance(source, (str, os.PathLike)):
+            data = load_delimited(source)
+        else:
+            data = np.asarray(source)
+        assert data.ndim == 2 and data.shape[1] == 2, "Source must have shape (N, 2)"
+
+        self.data = data
+        self.max_points = max_points
+        self.x_sorted = self._check_sorted() if x_sorted is None else x_sorted
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def _check_sorted(self) -> bool:
+        """Check whether the x column is non-decreasing, chunk by chunk."""
+        prev = -np.inf
+        for start in range(0, len(self), self.CHUNK_SIZE):
+            x = np.asarray(self.data[start:start + self.CHUNK_SIZE, 0])
+            if x.size and not (x[0] >= prev and np.all(x[1:] >= x[:-1])):
+                return False
+            if x.size:
+                prev = x[-1]
+        return True
+
+    def _bisect(self, value: float, side: str) -> int:
+        """
+        Binary search on the x column that reads single rows. np.searchsorted
+        would copy the (strided) x column of the whole source first.
+        """
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            x = self.data[mid, 0]
+            if x < value or (side == 'right' and x == value):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _max_points(self, width: int | None) -> int:
+        if self.max_points is not None:
+            return self.max_points
+        if width is not None:
+            return max(1, int(self.POINTS_PER_PIXEL * width))
+        return self.MAX_POINTS
+
+    def _extrema(self, lo: int, hi: int, xdom: Domain, num_buckets: int) -> npt.NDArray:
+        """
+        Reduce the sorted rows lo:hi to the rows with the minimum and maximum
+        y of each of num_buckets equal x buckets over xdom, in row order. Rows
+        outside xdom (padding) fall in a bucket on either side. The rows are
+        read in chunks of CHUNK_SIZE; a bucket that spans two chunks is
+        reduced per chunk.
+        """
+        span = xdom[1] - xdom[0]
+        scale = num_buckets / span if span > 0 else 0.0
+        kept = []
+        for start in range(lo, hi, self.CHUNK_SIZE):
+            rows = np.asarray(self.data[start:min(hi, start + self.CHUNK_SIZE)], dtype=float)
+            bucket = np.clip(np.floor((rows[:, 0] - xdom[0]) * scale), -1, num_buckets)
+
+            # Buckets are contiguous, as x is sorted. Keep the first row with
+            # the minimum and the first row with the maximum y of each one.
+            starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+            counts = np.diff(np.r_[starts, len(rows)])
+            ids = np.repeat(np.arange(len(starts)), counts)
+            keep = []
+            for reduce in (np.fmin, np.fmax):
+                idx = np.flatnonzero(rows[:, 1] == np.repeat(reduce.reduceat(rows[:, 1], starts), counts))
+                first = np.ones(len(idx), dtype=bool)
+                first[1:] = ids[idx][1:] != ids[idx][:-1]
+                keep.append(idx[first])
+            kept.append(rows[np.unique(np.concatenate(keep))])
+        return np.vstack(kept) if kept else np.empty((0, 2))
+
+    def visible(
+            self,
+            xdom: Domain,
+            ydom: Domain | None = None,
+            pad: int = 0,
+            width: int | None = None,
+            extrema: bool = False) -> npt.NDArray:
+        """
+        Return the rows within xdom (and ydom if given) as an in-memory array,
+        decimated to at most about max_points rows (see __init__; width is
+        the axes width in pixels).
+
+        For sorted sources, pad extra rows are included on either side of the
+        x range, so that lines continue up to the edge of the axes. With
+        extrema (for lines), xdom is split into max_points / 2 buckets and
+        each bucket is reduced to its rows with the minimum and maximum y, in
+        order, so peaks and single-sample spikes are kept. Otherwise the
+        range is strided so that only the returned rows are read. Unsorted
+        sources keep every step-th matching row, where step doubles whenever
+        the kept rows exceed max_points.
+        """
+        max_points = self._max_points(width)
+
+        if self.x_sorted:
+            lo = max(0, self._bisect(xdom[0], 'left') - pad)
+            hi = min(len(self), self._bisect(xdom[1], 'right') + pad)
+            if extrema and hi - lo > max_points:
+                rows = self._extrema(lo, hi, xdom, max(1, max_points // 2))
+                if ydom is None:
+                    return rows
+                return rows[(rows[:, 1] >= ydom[0]) & (rows[:, 1] <= ydom[1])]
+            step = max(1, -(-(hi - lo) // max_points))
+            rows = np.asarray(self.data[lo:hi:step], dtype=float)
+
+            # Keep the padding row at the end when it was stepped over
+            if step > 1 and hi > lo and (hi - 1 - lo) % step:
+                rows = np.vstack([rows, np.asarray(self.data[hi-1:hi], dtype=float)])
+            if ydom is None:
+                return rows
+            return rows[(rows[:, 1] >= ydom[0]) & (rows[:, 1] <= ydom[1])]
+
+        kept, num_kept, num_matched, step = [], 0, 0, 1
+        for start in range(0, len(self), self.CHUNK_SIZE):
+            rows = np.asarray(self.data[start:start + self.CHUNK_SIZE], dtype=float)
+            mask = (rows[:, 0] >= xdom[0]) & (rows[:, 0] <= xdom[1])
+            if ydom is not None:
+                mask &= (rows[:, 1] >= ydom[0]) & (rows[:, 1] <= ydom[1])
+
+            # Keep the matching rows whose running index is a multiple of step
+            matched = rows[mask]
+            kept.append(matched[(-num_matched) % step::step])
+            num_kept += len(kept[-1])
+            num_matched += len(matched)
+
+            # Halve the kept rows (keeping multiples of 2 * step) when over the limit
+            while num_kept > max_points:
+                kept = [np.vstack(kept)[::2]]
+                num_kept = len(kept[0])
+                step *= 2
+        return np.vstack(kept) if kept else np.empty((0, 2))
@@ -1,3 +1,4 @@
+import os
 from typing import Union
 import numpy as np
 import numpy.typing as npt
@@ -17,4 +18,8 @@ XYPlotDataBatch = npt.NDArray[np.float64 | np.int_]
 XYPlotData = XYPlotDataPoint | XYPlotDataBatch
 
 
- 
\ No newline at end of file
+ 
+
+# Zero-copy data source input: a .npy or delimited text path, np.memmap or
+# buffer-protocol array.
+XYDataSourceLike = str | os.PathLike | npt.ArrayLike
@@ -86,18 +86,21 @@ class Canvas:
         assert xdomain[0] < xdomain[1], f'xdomain error; {str(xdomain)}'
         assert ydomain[0] < ydomain[1], f'ydomain error; {str(ydomain)}'
         
+        # Update pos, dim , and legend dimensions. Done before updating the
+        # plots, since plots cache their pixel coordinates.
+        if pos is not None:
+            self.pos = np.array(pos)
+        if dim is not None:
+            self.dim = np.array(dim)
+        if (self.legend is not None) and (pos is not None or dim is not None):
+            self.legend.set_dimensions(self.pos, self.dim, self.plots)
+
         # Set axis domains, update metrics, and set element domains
         self.xaxis.set_dimensions(xdomain, ydomain)
         self.yaxis.set_dimensions(ydomain, xdomain)
         self._update_domain_metrics()
         for plot in self.plots:
             plot.set_dimensions()
-        
-        # Update pos, dim , and legend dimensions
-        if (self.legend is not None) and (pos is not None or dim is not None):
-            self.pos = np.array(pos)
-            self.dim = np.array(dim)
-            self.legend.set_dimensions()
             
     def set_title(self, title):
         """ Set the canvas title header."""
@@ -3,6 +3,10 @@ import pygame.gfxdraw
 import numpy as np
 from pygametools.color import Color
 from scipy.ndimage import zoom
+try:
+    from pygametools.plots.rasterize import raster_segments
+except ImportError:
+    raster_segments = None
 # from debug.time import ConsecutiveLineTimer, FuncStats
 
 
@@ -106,6 +110,26 @@ class PlotDraw:
         else:
             pygame.draw.line(screen, color, *endpoints, width)
 
+    def pgc_segments(self, screen, color, segments, width=1, aa=False):
+        """
+        >> Pygame coordinates
+        Draws a batch of unconnected line segments in a single color.
+        Segments should have shape (nr_segments, 2, 2). Segments of width 1
+        are rasterized in one numba kernel call straight into the screen
+        pixels when numba is available, instead of one draw call per segment.
+        """
+        if raster_segments is not None and width == 1 and screen.get_bytesize() in (3, 4):
+            segments = np.asarray(segments, dtype=float).reshape(-1, 2, 2)
+            raster_segments(
+                pygame.surfarray.pixels3d(screen), segments,
+                np.asarray(color[:3], dtype=np.uint8), aa)
+            return
+        for p1, p2 in np.asarray(segments).tolist():
+            if aa and width == 1:
+                pygame.draw.aaline(screen, color, p1, p2)
+            else:
+                pygame.draw.line(screen, color, p1, p2, width)
+
     def grc_tick(self, screen, color, position, offset):
         """
         >> Graph coordinates / Pygame coordinates
@@ -114,7 +138,14 @@ class PlotDraw:
         such as axis ticks and scatterpoint '+' markers.
         """
         position = self.coords(position)
-        pygame.draw.line(screen, color, position, position + offset)
+        self.pgc_tick(screen, color, position, offset)
+
+    def pgc_tick(self, screen, color, position, offset):
+        """
+        >> Pygame coordinates
+        Draws a line from a point to a given offset.
+        """
+        pygame.draw.line(screen, color, position, np.add(position, offset))
 
     def grc_point(self, screen, color, point, size):
         """
@@ -168,6 +199,15 @@ class PlotDraw:
             corners = ((left,top),(right,top),(right,bottom),(left,bottom))
             pygame.draw.lines(screen, Color.BLACK, True, corners, 1)
 
+    def pgc_rects(self, screen, color, rects):
+        """
+        >> Pygame coordinates
+        Fills a batch of rectangles, given as (left, top, width, height), in
+        a single color.
+        """
+        for rect in rects:
+            screen.fill(color, rect)
+
     def grc_text(self, screen, text, pos, font, offset=(0,0), centerx=False,
                  rjustx=False):
         """
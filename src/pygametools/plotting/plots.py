@@ -47,6 +47,17 @@ class DataPlot(Plot):
         attributesfrom to the Plot base class, as well as an implementation
         for the set_dimensions method and the add_data and set_data methods.
 
+        The pygame coordinates of all in-scope points are cached in self.pgc,
+        together with the start indices of the segments of consecutive
+        in-scope points. The cache is only recomputed by set_dimensions and
+        set_data, and extended by add_data, so drawing needs no coordinate
+        conversions.
+
+        When the x data is sorted (e.g. time series), in-scope points are
+        found with a binary search on the x domain, so only the y values of
+        the visible slice are checked. Unsorted data falls back to checking
+        all points with PlotDraw.inscope_points.
+
         Parameters
         ----------
         label : String
@@ -58,14 +69,84 @@ class DataPlot(Plot):
         """
         super().__init__(canvas, label, color)
         self.size = size
-        self.in_scope = np.empty(0, bool)
+        self.x_sorted = True
+
+        # Cached pygame coordinates of in-scope points
+        self.pgc = np.empty((0, 2), int)
+        self._scope_indices = np.empty(0, int)
+        self._segment_starts = np.empty(0, int)
+
+    @property
+    def in_scope(self):
+        """
+        Boolean vector that indicates for each point wether it is within the
+        canvas domain.
+        """
+        in_scope = np.zeros(self.x.shape[0], bool)
+        in_scope[self._scope_indices] = True
+        return in_scope
 
     def set_dimensions(self):
         """
         Called from canvas at domain changes. Determines  in scope points
         for the x and y dataset with respect to the Canvas domain.
         """
-        self.in_scope = self.canvas.pdraw.inscope_points(self.x, self.y)
+        self._update_pgc(start=0)
+
+    def _inscope_indices(self, start):
+        """
+        Return the indices of all points from index start onward that are
+        within the canvas domain.
+        """
+        x, y = self.x[start:], self.y[start:]
+        if not self.x_sorted:
+            return np.flatnonzero(self.canvas.pdraw.inscope_points(x, y)) + start
+
+        # Binary search for the visible x range, then only check y values
+        xdomain, ydomain = self.canvas.xaxis.domain, self.canvas.yaxis.domain
+        lo = np.searchsorted(x, xdomain[0], side='left')
+        hi = np.searchsorted(x, xdomain[1], side='right')
+        visible_y = y[lo:hi]
+        visible = (visible_y >= ydomain[0]) & (visible_y <= ydomain[1])
+        return np.flatnonzero(visible) + lo + start
+
+    def _update_pgc(self, start):
+        """
+        Update the pygame coordinate cache for all data from index start
+        onward. With start=0 the whole cache is rebuilt, otherwise the cache
+        is extended with the data that was appended since the last update.
+        """
+        if start == 0:
+            self.pgc = np.empty((0, 2), int)
+            self._scope_indices = np.empty(0, int)
+            self._segment_starts = np.empty(0, int)
+
+        new_indices = self._inscope_indices(start)
+        new_pgc = self.canvas.pdraw.coords(
+            np.column_stack((self.x[new_indices], self.y[new_indices])))
+
+        # A new segment starts wherever in-scope indices are not consecutive
+        last_index = self._scope_indices[-1] if self._scope_indices.size else -2
+        gaps = np.diff(np.concatenate(([last_index], new_indices))) != 1
+        new_starts = np.flatnonzero(gaps) + self._scope_indices.size
+
+        self.pgc = np.vstack((self.pgc, new_pgc))
+        self._scope_indices = np.concatenate((self._scope_indices, new_indices))
+        self._segment_starts = np.concatenate((self._segment_starts, new_starts))
+
+    @property
+    def segments(self):
+        """
+        Return (start, stop) index pairs into self.pgc for every segment of
+        consecutive in-scope points.
+        """
+        stops = np.append(self._segment_starts[1:], self.pgc.shape[0])
+        return zip(self._segment_starts.tolist(), stops.tolist())
+
+    @staticmethod
+    def _is_sorted(x):
+        """Return True if x is non-decreasing and contains no NaN values."""
+        return bool(np.all(x[1:] >= x[:-1])) and not np.isnan(x[:1]).any()
 
     def add_data(self, x, y):
         """
@@ -76,10 +157,13 @@ class DataPlot(Plot):
         x = np.reshape(x, -1)
         y = np.reshape(y, -1)
 
+        start = self.x.shape[0]
+        continues_sorted = start == 0 or x.size == 0 or x[0] >= self.x[-1]
+        self.x_sorted = self.x_sorted and continues_sorted and self._is_sorted(x)
+
         self.x = np.concatenate((self.x, x))
         self.y = np.concatenate((self.y, y))
-        new_in_scope = self.canvas.pdraw.inscope_points(x, y)
-        self.in_scope = np.concatenate((self.in_scope, new_in_scope))
+        self._update_pgc(start)
         return self
 
     def set_data(self, x, y):
@@ -89,7 +173,8 @@ class DataPlot(Plot):
         """
         self.x = np.reshape(x, -1)
         self.y = np.reshape(y, -1)
-        self.in_scope = self.canvas.pdraw.inscope_points(self.x, self.y)
+        self.x_sorted = self._is_sorted(self.x)
+        self._update_pgc(start=0)
         return self
 
 
@@ -103,18 +188,12 @@ class Line(DataPlot):
 
     def draw(self, screen):
         """
-        Splits the data into in-scope line segments and draws them using
-        the plotdraw instance.
+        Draws the cached in-scope line segments using the plotdraw instance.
         """
-        if len(self.x) < 2:
-            return
-        indices = np.nonzero(self.in_scope[1:] != self.in_scope[:-1])[0] + 1
-        segments = np.split(np.transpose((self.x, self.y)), indices)
-        segments = segments[0::2] if self.in_scope[0] else segments[1::2]
-        for segment in segments:
-            if len(segment) >= 2:
-                self.canvas.pdraw.grc_lines(
-                    screen, self.color, segment, self.size, aa=True)
+        for start, stop in self.segments:
+            if stop - start >= 2:
+                self.canvas.pdraw.pgc_lines(
+                    screen, self.color, self.pgc[start:stop], self.size, aa=True)
 
 
 
@@ -136,49 +215,115 @@ class Scatter(DataPlot):
         options are drawn as a collection of lines (ticks) offsetted from the
         point coordinate.
         """
-        points = np.transpose((self.x[self.in_scope], self.y[self.in_scope]))
+        l = self.size/2
+        if self.marker == '+':
+            offsets = np.array([(-l,0),(l,0),(0,-l),(0,l)])
+        elif self.marker == 'x':
+            offsets = np.array([(l,l),(-l,l),(l,-l),(-l,-l)])
 
-        for point in points:
+        for point in self.pgc.tolist():
             if self.marker == 'o':
-                self.canvas.pdraw.grc_point(screen, self.color, point, self.size)
-            elif self.marker == '+':
-                l = self.size/2
-                for offset in [(-l,0),(l,0),(0,-l),(0,l)]:
-                    self.canvas.pdraw.grc_tick(screen, self.color, point, offset)
-            elif self.marker == 'x':
-                l = self.size/2
-                for offset in [(l,l),(-l,l),(l,-l),(-l,-l)]:
-                    self.canvas.pdraw.grc_tick(screen, self.color, point, offset)
+                self.canvas.pdraw.pgc_point(screen, self.color, point, self.size)
+            else:
+                for offset in offsets:
+                    self.canvas.pdraw.pgc_tick(screen, self.color, point, offset)
 
 
 
 class Bar(DataPlot):
 
-    def __init__(self, canvas, plot, color, width, label):
+    def __init__(self, canvas, label, color, width):
         """
         Bar plot. Inherits from the DataPlot class. The x coordinates
         determine the bar positioning, the y coordinates the bar heigth.
+        The bar width is given in graph coordinates.
+        """
+        super().__init__(canvas, label, color, width)
+        self.rects = []
+
+    def _update_pgc(self, start):
+        """
+        Also computes the pygame rects (left, top, width, height) of all new
+        in-scope bars in one vectorized pass, from the cached top-center
+        coordinates of the bars.
         """
-        super().__init__(canvas, plot, color, width, label)
+        if start == 0:
+            self.rects = []
+        nr_cached = self.pgc.shape[0] if start > 0 else 0
+        super()._update_pgc(start)
+
+        base = self.canvas.pdraw.coords((self.canvas.d_min[0], 0))[1]
+        half_width = self.size / 2 * self.canvas.dim[0] / self.canvas.d_len[0]
+        center, top = self.pgc[nr_cached:].T
+        rects = np.column_stack((
+            center - half_width,
+            np.minimum(top, base),
+            np.full(center.shape, 2 * half_width),
+            np.abs(top - base))).astype(int)
+        self.rects.extend(map(tuple, rects.tolist()))
 
     def draw(self, screen):
         """
-        Uses the plotdraw instance to draw each bar.
+        Uses the plotdraw instance to fill all cached bar rects.
         """
-        bars = zip(self.x[self.in_scope], self.y[self.in_scope])
-        for center, top in bars:
-            top_left = (center - self.size/2, top)
-            lower_right = (center + self.size/2, 0)
-            self.canvas.pdraw.grc_rect(screen, self.color, top_left, lower_right)
+        self.canvas.pdraw.pgc_rects(screen, self.color, self.rects)
+
+
+
+class Histogram(Bar):
+
+    def __init__(self, canvas, label, color, bin_range, nr_bins):
+        """
+        Streaming histogram plot with evenly spaced bins. Inherits from the
+        Bar class. Samples are added with add_samples, which only bins the
+        new samples and adds them to the running bin counts, so the cost
+        per update does not grow with the sample history. Samples outside of
+        bin_range are ignored.
+
+        Parameters
+        ----------
+        bin_range : Tuple
+            (min, max) of the histogram bins in graph coordinates.
+        nr_bins : Integer
+            Number of bins.
+        """
+        self.bin_edges = np.linspace(*bin_range, num=nr_bins + 1)
+        self.bin_width = self.bin_edges[1] - self.bin_edges[0]
+        self.bin_centers = self.bin_edges[:-1] + self.bin_width / 2
+        self.counts = np.zeros(nr_bins, int)
+        super().__init__(canvas, label, color, self.bin_width)
+
+    def add_samples(self, samples):
+        """
+        Add samples to the histogram counts. Returns self to allow one-line
+        instantiating and addding samples.
+        """
+        samples = np.reshape(samples, -1)
+        bins = np.floor((samples - self.bin_edges[0]) / self.bin_width)
+
+        # Samples at the upper edge belong to the last bin
+        bins[samples == self.bin_edges[-1]] = self.counts.shape[0] - 1
+        valid = (bins >= 0) & (bins < self.counts.shape[0])
+        self.counts += np.bincount(
+            bins[valid].astype(int), minlength=self.counts.shape[0])
+        self.set_data(self.bin_centers, self.counts)
+        return self
+
+    def clear(self):
+        """Reset all bin counts to zero."""
+        self.counts[:] = 0
+        self.set_data(self.bin_centers, self.counts)
 
 
 
 class Network(Plot):
 
         # TODO:
-        #    - Compute coordinates in class with size parameter
         #    - Handle in_scope points
 
+    # Number of quantized color levels for each sign of the edge values
+    EDGE_COLOR_LEVELS = 32
+
     def __init__(self, canvas, label, node_coords, edge_coords, **kwargs):
         """
         Plots a network that dynamically colors nodes and edges based on
@@ -216,8 +361,40 @@ class Network(Plot):
         # Set self.x and self.y for autofitting canvas domain
         self.x, self.y = self.node_coords
 
+        # Cached pygame coordinates, recomputed in set_dimensions
+        self._node_pgc = np.empty((0, 2), int)
+        self._edge_pgc = np.empty((0, 2, 2), int)
+
+        # Cached colors and draw order, recomputed in set_values
+        self._node_colors = []
+        self._edge_batches = []
+        self._lit_nodes = np.zeros(self.node_coords.shape[1], bool)
+
+        self.set_dimensions()
+        self.set_values(self.node_values, self.edge_values)
+
     def set_dimensions(self):
-        pass
+        """
+        Called from canvas at domain changes. Converts all node and edge
+        coordinates to pygame coordinates in one pass.
+        """
+        self._node_pgc = self.canvas.pdraw.coords(self.node_coords.T)
+        endpoints = np.transpose(self.edge_coords, (0, 2, 1)).reshape(-1, 2)
+        self._edge_pgc = self.canvas.pdraw.coords(endpoints).reshape(-1, 2, 2)
+
+    def value_colors(self, values):
+        """
+        Return an array of shape (n, 3) with the colors for n values. Values
+        that are np.nan are colored grey.
+        """
+        values = np.asarray(values, dtype=float)
+        isnan = np.isnan(values)
+        colors = np.where(
+            (values >= 0)[:, np.newaxis],
+            self.colgradient_pos.get_colors(np.where(isnan, 0, values)),
+            self.colgradient_neg.get_colors(np.where(isnan, 0, -values)))
+        colors[isnan] = Color.GREY3
+        return colors.astype(int)
 
     def set_values(self, node_values, edge_values):
         """
@@ -225,49 +402,64 @@ class Network(Plot):
         elements as follows: red: val < 0, white/grey: val = 0, green: val > 0.
         Values are between (1-, 1). When the values for nodes or edges are
         np.nan, they will be colored grey in the plot.
-        """
-        self.node_values = node_values
-        self.edge_values = edge_values
+
+        Node colors, lit nodes, and the edge draw batches are computed here,
+        so that drawing does not depend on the number of distinct values.
+        Edges are quantized to EDGE_COLOR_LEVELS colors per sign, and the
+        batches are sorted on their absolute value so that the 'high opacity'
+        edges are drawn last.
+        """
+        self.node_values = np.asarray(node_values, dtype=float)
+        self.edge_values = np.asarray(edge_values, dtype=float)
+
+        # Node colors and lit output layer nodes
+        self._node_colors = [tuple(c) for c in self.value_colors(self.node_values)]
+        output_layer = self.x == (self.x.max() if self.x.size else 0)
+        self._lit_nodes = (self.node_values >= 0.5) & output_layer
+
+        # Quantize edge values. NaN edges get the highest key, like argsort
+        levels = self.EDGE_COLOR_LEVELS
+        quantized = np.rint(np.clip(self.edge_values, -1, 1) * levels)
+        isnan = np.isnan(quantized)
+        if quantized.size == 0:
+            self._edge_batches = []
+            return
+        key = np.where(isnan, 2 * levels + 1, quantized + levels).astype(int)
+        order_key = np.where(isnan, levels + 1, np.abs(quantized))
+        order = np.lexsort((key, order_key))
+
+        # Split ordered edge indices into batches of a single color
+        sorted_key = key[order]
+        boundaries = np.flatnonzero(np.diff(sorted_key)) + 1
+        batch_keys = sorted_key[np.concatenate(([0], boundaries)).astype(int)]
+        batch_values = np.where(
+            batch_keys > 2 * levels, np.nan, (batch_keys - levels) / levels)
+        batch_colors = self.value_colors(batch_values)
+        self._edge_batches = [
+            (tuple(color), indices) for color, indices
+            in zip(batch_colors, np.split(order, boundaries))]
 
     def draw(self, screen):
         """
         Draws all edges and nodes of the network. Nodes and edges are colored
         according to their values in self.node_values and self.edge_values.
         The smaller a value is to zero, the closer a color gets to
-        self.color_mid. Edges are sorted on their absolute value prior to
-        drawing so thtat the 'high opacity' edges are drawn last.
-        """
-        # Draw edges in order of abs value to mimmic opacity
-        e_order = np.argsort(abs(self.edge_values))
-        e_coords = self.edge_coords[e_order]
-        e_vals = self.edge_values[e_order]
-        for edge, val in zip(e_coords, e_vals):
-            if str(val) == 'nan':
-                col = Color.GREY3
-            elif val >= 0:
-                col = self.colgradient_pos.get_color(val)
-            elif val < 0:
-                col = self.colgradient_neg.get_color(abs(val))
-            self.canvas.pdraw.grc_line(screen, col, edge.T, aa=True)
+        self.color_mid. Coordinates and colors are cached, so drawing only
+        consists of the pygame draw calls.
+        """
+        pdraw = self.canvas.pdraw
+
+        # Draw edges in batches in order of abs value to mimmic opacity
+        for color, indices in self._edge_batches:
+            pdraw.pgc_segments(screen, color, self._edge_pgc[indices], aa=True)
 
         # Draw nodes
-        n_coords = self.node_coords.T
-        n_vals = self.node_values
-        for node, val in zip(n_coords, n_vals):
-            if str(val) == 'nan':
-                col = Color.GREY3
-            elif val >= 0:
-                col = self.colgradient_pos.get_color(val)
-            elif val < 0:
-                col = self.colgradient_neg.get_color(abs(val))
-            self.canvas.pdraw.grc_point(screen, col, node, self.node_size)
+        for node, color in zip(self._node_pgc.tolist(), self._node_colors):
+            pdraw.pgc_point(screen, color, node, self.node_size)
 
         # Draw lit node circles
-        output_layer = n_coords.T[0] == n_coords.T[0].max()
-        lit_nodes = ((n_vals >= 0.5) & output_layer)
-        for node, val in zip(n_coords[lit_nodes], n_vals[lit_nodes]):
-            self.canvas.pdraw.grc_circle(
-                screen, self.color_lit, node, self.node_size+1)
+        for node in self._node_pgc[self._lit_nodes].tolist():
+            pdraw.pgc_circle(screen, self.color_lit, node, self.node_size+1)
 
 
 
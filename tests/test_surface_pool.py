@@ -0,0 +1,61 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from pygametools.plots.drawing import PlotRenderer, SurfacePool
+
+
+def test_shrink_and_regrow_reuses_backings():
+    pool = SurfacePool()
+    renderer = PlotRenderer((100, 100), (80, 80), pool=pool)
+    small_canvas, small_axes = renderer._backing_canvas, renderer._backing_axes
+
+    # Grow: the small backings are released and free, as no views remain
+    renderer.resize((400, 400), (300, 300))
+    large_canvas, large_axes = renderer._backing_canvas, renderer._backing_axes
+
+    # Shrink back: the small backings are reused
+    renderer.resize((100, 100), (80, 80))
+    assert renderer._backing_canvas is small_canvas
+    assert renderer._backing_axes is small_axes
+
+    # Regrow: the large backings are reused
+    renderer.resize((400, 400), (300, 300))
+    assert renderer._backing_canvas is large_canvas
+    assert renderer._backing_axes is large_axes
+
+    # A second renderer gets the small backings
+    other = PlotRenderer((100, 100), (80, 80), pool=pool)
+    assert other._backing_canvas is small_canvas
+    assert other._backing_axes is small_axes
+
+
+def test_held_view_blocks_reuse():
+    pool = SurfacePool()
+    renderer = PlotRenderer((100, 100), (80, 80), pool=pool)
+    held = renderer.surface_axes
+    small_axes = renderer._backing_axes
+
+    renderer.resize((400, 400), (300, 300))
+    other = PlotRenderer((100, 100), (80, 80), pool=pool)
+    assert other._backing_axes is not small_axes
+
+    # Once the view is dropped, the backing is free again
+    del held
+    third = PlotRenderer((100, 100), (80, 80), pool=pool)
+    assert third._backing_axes is small_axes
+
+
+def test_release_frees_backings():
+    pool = SurfacePool()
+    renderer = PlotRenderer((100, 100), (80, 80), pool=pool)
+    backings = renderer._backing_canvas, renderer._backing_axes
+    renderer.release()
+    free = [surface for surfaces in pool._free.values() for surface in surfaces]
+    assert all(any(surface is backing for surface in free) for backing in backings)
+
+
+if __name__ == '__main__':
+    test_shrink_and_regrow_reuses_backings()
+    test_held_view_blocks_reuse()
+    test_release_frees_backings()
+    print('ok')